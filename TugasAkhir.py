@@ -1,9 +1,13 @@
-import customtkinter as ctk
-from tkinter import messagebox
-import json
 import os
-import sys
-from datetime import datetime, date
+import threading
+import customtkinter as ctk
+from tkinter import messagebox, filedialog
+from datetime import datetime
+
+from inventory_analytics import InventoryAnalytics, format_report
+from inventory_core import InventorySystem
+from inventory_perf import perf, install_signal_dump
+from inventory_scanner import SCAN_POLL_MS, ScanSession, format_totals
 
 COLOR_BG_MAIN = "#1a1f2c"
 COLOR_BG_SIDEBAR = "#222b33"
@@ -14,184 +18,35 @@ COLOR_DANGER = "#e53e3e"
 COLOR_WARNING = "#d69e2e"
 COLOR_SUCCESS = "#38a169"
 
-ctk.set_appearance_mode("Dark")
-
-class Stack:
-    def __init__(self): self.items = []
-    def push(self, value): self.items.append(value)
-    def pop(self): return self.items.pop() if self.items else None
-
-class Queue:
-    def __init__(self): self.items = []
-    def enqueue(self, value): self.items.append(value)
-    def dequeue(self): return self.items.pop(0) if self.items else None
-
-class Item:
-    category_counter = {}
-
-    def __init__(self, name, category, price, stock, sku=None):
-        self.name = name
-        self.category = category
-        self.price = price
-        self.stock = stock
-
-        if sku:
-            self.sku = sku
-            if category not in Item.category_counter:
-                Item.category_counter[category] = 1
-        else:
-            if category not in Item.category_counter:
-                Item.category_counter[category] = 1
-
-            num = Item.category_counter[category]
-            cat_prefix = category[:3].upper() if len(category) >= 3 else category.upper()
-            self.sku = f"{cat_prefix}-{num:03d}"
-            Item.category_counter[category] += 1
-
-class InventorySystem:
-    def __init__(self):
-        self.items = []
-
-        self.stock_in = Queue()
-        self.stock_out = Stack()
-        self.recent_activity = []
-        
-        self.daily_in = 0
-        self.daily_out = 0
-        self.current_date = date.today()
-
-        if getattr(sys, 'frozen', False):
-            application_path = os.path.dirname(sys.executable)
-        elif __file__:
-            application_path = os.path.dirname(__file__)
-            
-        self.data_file = os.path.join(application_path, "inventory_data.json")
-        print(f"File database lokasi di: {self.data_file}")
-        
-        self.load_data()
-
-    def load_data(self):
-        if not os.path.exists(self.data_file):
-            return
-
-        try:
-            with open(self.data_file, "r") as f:
-                data = json.load(f)
-
-                last_date_str = data.get("date", str(date.today()))
-                last_date = datetime.strptime(last_date_str, "%Y-%m-%d").date()
+STOCK_STATUS = {
+    "ok": (COLOR_SUCCESS, "In Stock"),
+    "low": (COLOR_WARNING, "Low Stock"),
+    "out": (COLOR_DANGER, "Out of Stock"),
+}
 
-                if last_date == date.today():
-                    self.daily_in = data.get("daily_in", 0)
-                    self.daily_out = data.get("daily_out", 0)
-                else:
-                    self.daily_in = 0
-                    self.daily_out = 0
-                    print("System: Hari berganti, reset daily stats.")
+INVENTORY_PAGE_SIZE = 25
+SEARCH_DEBOUNCE_MS = 250
+SUGGEST_DEBOUNCE_MS = 150
+SUGGEST_LIMIT = 5
+PERF_PANEL_REFRESH_MS = 1000
+LOAD_POLL_MS = 200
+REMOTE_POLL_MS = 100
 
-                self.items = []
-                Item.category_counter = {}
-                for item_data in data.get("items", []):
-                    new_item = Item(item_data['name'], item_data['category'], item_data['price'], item_data['stock'])
-                    new_item.sku = item_data['sku'] 
-                    self.items.append(new_item)
-
-                self.recent_activity = data.get("recent_activity", [])
-
-        except Exception as e:
-            print(f"Gagal load data: {e}")
-
-    def save_data(self):
-        try:
-            items_data = []
-            for item in self.items:
-                items_data.append({
-                    "name": item.name,
-                    "sku": item.sku,
-                    "category": item.category,
-                    "price": item.price,
-                    "stock": item.stock
-                })
-
-            data = {
-                "date": str(date.today()),
-                "daily_in": self.daily_in,
-                "daily_out": self.daily_out,
-                "items": items_data,
-                "recent_activity": self.recent_activity
-            }
-
-            with open(self.data_file, "w") as f:
-                json.dump(data, f, indent=4)
-            print("Data berhasil disimpan.")
-            
-        except Exception as e:
-            print(f"Error Saving Data: {e}")
-            messagebox.showerror("Save Error", f"Gagal menyimpan data: {e}")
-
-    
-    def check_daily_reset(self):
-        now = date.today()
-        if now != self.current_date:
-            self.daily_in = 0
-            self.daily_out = 0
-            self.current_date = now
-            return True
-        return False
-
-    def add_item(self, name, category, price, stock):
-        self.items.append(Item(name, category, price, stock))
-        self.log_activity(f"New Item: {name}", "add")
-        self.save_data()
-
-    def search_item(self, name_or_sku):
-        text = name_or_sku.strip().lower()
-        for item in self.items:
-            if text in item.name.lower() or text in item.sku.lower():
-                return item
-        return None
-
-    def add_stock(self, name, amount):
-        item = self.search_item(name)
-        if item:
-            self.stock_in.enqueue(f"{item.name} (+{amount})")
-            item.stock += amount
-            self.daily_in += amount
-            self.log_activity(f"Stock In: {amount}x {item.name}", "in")
-            self.save_data()
-            return True
-        return False
-
-    def remove_stock(self, name, amount):
-        item = self.search_item(name)
-        if item and item.stock >= amount:
-            self.stock_out.push(f"{item.name} (-{amount})")
-            item.stock -= amount
-            self.daily_out += amount
-            self.log_activity(f"Stock Out: {amount}x {item.name}", "out")
-            self.save_data()
-            return True
-        return False
-
-    def delete_item(self, name):
-        item = self.search_item(name)
-        if item:
-            self.items.remove(item)
-            self.log_activity(f"Deleted: {item.name}", "del")
-            self.save_data()
-            return True
-        return False
-
-    def log_activity(self, text, type):
-        self.recent_activity.insert(0, {"text": text, "type": type})
-        if len(self.recent_activity) > 10:
-            self.recent_activity.pop()
+ctk.set_appearance_mode("Dark")
 
 class InventoryApp(ctk.CTk):
     def __init__(self):
         super().__init__()
-        self.system = InventorySystem()
-        self.system.load_data()
+        # INVENTORY_SERVER=host:port -> counter ini memakai inventory_server.py bersama counter lain.
+        if os.environ.get("INVENTORY_SERVER"):
+            from inventory_remote import RemoteInventorySystem
+            self.system = RemoteInventorySystem(lazy=True)
+        else:
+            self.system = InventorySystem(lazy=True)
+        self.system.start_background_load()
+        self.analytics = InventoryAnalytics(self.system)
+        self.scanner = ScanSession(self.system)
+        self.scanner_shown = None
 
         self.title("Faaza Gadget Store Inventory Manager")
         self.geometry("1200x700")
@@ -201,11 +56,83 @@ class InventoryApp(ctk.CTk):
         self.grid_rowconfigure(0, weight=1)
 
         self.current_active_button = None
+        self.current_page = None
+        self.create_fonts()
         self.create_sidebar()
         self.create_pages()
+        self.card_values = {}
+        self.update_cards(self.system.dashboard_stats())
+        self.system.subscribe(self.on_system_change)
         self.show_frame("Dashboard")
         
         self.update_time_system()
+        self.system.start_persistence()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(LOAD_POLL_MS, self.check_loading)
+        if self.system.backend == "remote":
+            self.after(REMOTE_POLL_MS, self.poll_remote)
+        self.after(SCAN_POLL_MS, self.poll_scanner)
+
+        # Panel performa sengaja tersembunyi: Ctrl+Shift+P atau kill -USR1 <pid>.
+        self.perf_panel = None
+        self.bind_all("<Control-P>", self.toggle_perf_panel)
+        install_signal_dump()
+
+    def check_loading(self):
+        self.update_cards(self.system.dashboard_stats())
+        if self.system.loaded.is_set():
+            self.refresh_data()
+            # Index pencarian typo dibangun di belakang supaya ketikan pertama tidak tersendat.
+            threading.Thread(target=self.system.search.ensure_index, name="search-warmup", daemon=True).start()
+        else:
+            self.after(LOAD_POLL_MS, self.check_loading)
+
+    def poll_remote(self):
+        # Perubahan dari counter lain diterapkan di thread UI; on_system_change yang memperbarui baris.
+        self.system.poll_changes()
+        self.after(REMOTE_POLL_MS, self.poll_remote)
+
+    def poll_scanner(self):
+        # Scan dikumpulkan di queue; di sini digabung per SKU dan diterapkan per window.
+        if self.system.loaded.is_set():
+            self.scanner.drain()
+            if self.current_page == "Scanner":
+                self.render_scanner()
+        self.after(SCAN_POLL_MS, self.poll_scanner)
+
+    def ensure_loaded(self):
+        if not self.system.loaded.is_set():
+            messagebox.showwarning("Loading", "Data masih dimuat, coba lagi sebentar.")
+            return False
+        return True
+
+    def toggle_perf_panel(self, event=None):
+        if self.perf_panel is not None:
+            self.perf_panel.destroy()
+            self.perf_panel = None
+            return
+
+        self.perf_panel = ctk.CTkToplevel(self)
+        self.perf_panel.title("Performance")
+        self.perf_panel.geometry("720x420")
+        self.perf_panel.protocol("WM_DELETE_WINDOW", self.toggle_perf_panel)
+        self.perf_text = ctk.CTkTextbox(self.perf_panel, font=ctk.CTkFont(family="Courier", size=12))
+        self.perf_text.pack(fill="both", expand=True, padx=10, pady=10)
+        ctk.CTkButton(self.perf_panel, text="Reset", fg_color=COLOR_BG_SIDEBAR, command=perf.reset).pack(pady=(0, 10))
+        self.update_perf_panel()
+
+    def update_perf_panel(self):
+        if self.perf_panel is None:
+            return
+        self.perf_text.delete("1.0", "end")
+        self.perf_text.insert("1.0", perf.report())
+        self.after(PERF_PANEL_REFRESH_MS, self.update_perf_panel)
+
+    def on_close(self):
+        if self.system.loaded.is_set():
+            self.scanner.stop()
+        self.system.close()
+        self.destroy()
 
     def update_time_system(self):
         now = datetime.now()
@@ -219,12 +146,23 @@ class InventoryApp(ctk.CTk):
             self.refresh_data()
             print("System: Daily stats reset triggered.")
 
+        errors = self.system.poll_errors()
+        if errors:
+            messagebox.showerror("Save Error", "\n".join(errors))
+
         self.after(1000, self.update_time_system)
 
+    def create_fonts(self):
+        self.fonts = {
+            "row_name": ctk.CTkFont(weight="bold"),
+            "badge": ctk.CTkFont(size=8),
+            "action": ctk.CTkFont(size=10),
+        }
+
     def create_sidebar(self):
         self.sidebar = ctk.CTkFrame(self, width=240, corner_radius=0, fg_color=COLOR_BG_SIDEBAR)
         self.sidebar.grid(row=0, column=0, sticky="nsew")
-        self.sidebar.grid_rowconfigure(6, weight=1)
+        self.sidebar.grid_rowconfigure(7, weight=1)
 
         profile_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
         profile_frame.grid(row=0, column=0, padx=20, pady=30, sticky="ew")
@@ -239,9 +177,11 @@ class InventoryApp(ctk.CTk):
         self.btn_inv = self.create_sidebar_btn(2, "Inventory List", "Inventory")
         self.btn_in = self.create_sidebar_btn(3, "Stock In", "StockIn")
         self.btn_out = self.create_sidebar_btn(4, "Stock Out", "StockOut")
+        self.btn_analytics = self.create_sidebar_btn(5, "Analytics", "Analytics")
+        self.btn_scanner = self.create_sidebar_btn(6, "Scanner", "Scanner")
 
         self.time_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
-        self.time_frame.grid(row=7, column=0, sticky="ew", padx=20, pady=20)
+        self.time_frame.grid(row=8, column=0, sticky="ew", padx=20, pady=20)
         
         self.lbl_time = ctk.CTkLabel(self.time_frame, text="00:00:00", font=ctk.CTkFont(size=24, weight="bold"), text_color=COLOR_TEXT_WHITE)
         self.lbl_time.pack(anchor="w")
@@ -297,7 +237,9 @@ class InventoryApp(ctk.CTk):
         self.search_bar = ctk.CTkEntry(frame_inv, placeholder_text="Search by name or SKU...", height=45, border_width=0, fg_color=COLOR_BG_SIDEBAR, text_color=COLOR_TEXT_WHITE)
         self.search_bar.pack(fill="x", pady=(0, 20))
         self.search_bar.bind("<KeyRelease>", self.on_search_key)
-        self.search_bar.bind("<Return>", self.on_search_key)
+        self.search_bar.bind("<Return>", self.run_search)
+        self.search_job = None
+        self.last_query = ""
 
         table_header = ctk.CTkFrame(frame_inv, fg_color="transparent")
         table_header.pack(fill="x", padx=10, pady=(0,5))
@@ -312,9 +254,57 @@ class InventoryApp(ctk.CTk):
         self.scroll_inv = ctk.CTkScrollableFrame(frame_inv, fg_color="transparent")
         self.scroll_inv.pack(fill="both", expand=True)
 
+        pager = ctk.CTkFrame(frame_inv, fg_color="transparent")
+        pager.pack(fill="x", pady=(10, 0))
+        ctk.CTkButton(pager, text="< Prev", width=80, fg_color=COLOR_BG_SIDEBAR, command=lambda: self.change_inventory_page(-1)).pack(side="left")
+        ctk.CTkButton(pager, text="Next >", width=80, fg_color=COLOR_BG_SIDEBAR, command=lambda: self.change_inventory_page(1)).pack(side="right")
+        self.lbl_page = ctk.CTkLabel(pager, text="", text_color=COLOR_TEXT_GRAY)
+        self.lbl_page.pack()
+
+        self.inventory_page = 0
+        self.inventory_rows = []
+
+        self.activity_empty = ctk.CTkLabel(self.activity_frame, text="No recent activity.", text_color=COLOR_TEXT_GRAY)
+        self.activity_rows = []
+
         self.create_transaction_page("StockIn", "Stock In (Masuk)", COLOR_ACCENT, self.action_stock_in, content_container)
         self.create_transaction_page("StockOut", "Stock Out (Keluar)", COLOR_DANGER, self.action_stock_out, content_container)
 
+        frame_analytics = ctk.CTkFrame(content_container, fg_color="transparent")
+        self.frames["Analytics"] = frame_analytics
+
+        header_analytics = ctk.CTkFrame(frame_analytics, fg_color="transparent")
+        header_analytics.pack(fill="x", pady=(0, 20))
+        ctk.CTkLabel(header_analytics, text="Analytics", font=ctk.CTkFont(size=28, weight="bold"), text_color=COLOR_TEXT_WHITE).pack(side="left")
+        ctk.CTkButton(header_analytics, text="Export CSV", fg_color=COLOR_ACCENT, font=ctk.CTkFont(weight="bold"), height=40, command=self.action_export_analytics).pack(side="right")
+
+        self.analytics_text = ctk.CTkTextbox(frame_analytics, font=ctk.CTkFont(family="Courier", size=13), fg_color=COLOR_BG_SIDEBAR, corner_radius=15)
+        self.analytics_text.pack(fill="both", expand=True)
+        self.analytics_text.configure(state="disabled")
+        self.analytics_shown = None
+
+        frame_scanner = ctk.CTkFrame(content_container, fg_color="transparent")
+        self.frames["Scanner"] = frame_scanner
+
+        header_scanner = ctk.CTkFrame(frame_scanner, fg_color="transparent")
+        header_scanner.pack(fill="x", pady=(0, 20))
+        ctk.CTkLabel(header_scanner, text="Barcode Scanner", font=ctk.CTkFont(size=28, weight="bold"), text_color=COLOR_TEXT_WHITE).pack(side="left")
+        ctk.CTkButton(header_scanner, text="Buka Feed (File / Pipe)", fg_color=COLOR_BG_SIDEBAR, height=40, command=self.action_open_scan_feed).pack(side="right")
+        self.scan_kind = ctk.CTkSegmentedButton(header_scanner, values=["Stock In", "Stock Out"], command=self.action_scan_kind)
+        self.scan_kind.set("Stock In")
+        self.scan_kind.pack(side="right", padx=10)
+
+        # Scanner keyboard-wedge mengetik SKU lalu Enter ke field ini.
+        self.scan_entry = ctk.CTkEntry(frame_scanner, placeholder_text="Scan barcode di sini...", height=45, border_width=0, fg_color=COLOR_BG_SIDEBAR, text_color=COLOR_TEXT_WHITE)
+        self.scan_entry.pack(fill="x", pady=(0, 20))
+        self.scan_entry.bind("<Return>", self.on_scan)
+
+        self.lbl_scan_totals = ctk.CTkLabel(frame_scanner, text="", font=ctk.CTkFont(size=16, weight="bold"), text_color=COLOR_TEXT_WHITE, anchor="w")
+        self.lbl_scan_totals.pack(fill="x", pady=(0, 10))
+        self.scan_text = ctk.CTkTextbox(frame_scanner, font=ctk.CTkFont(family="Courier", size=13), fg_color=COLOR_BG_SIDEBAR, corner_radius=15)
+        self.scan_text.pack(fill="both", expand=True)
+        self.scan_text.configure(state="disabled")
+
     def create_dash_card(self, parent, col_idx, icon_text, title, value, icon_color=COLOR_ACCENT):
         card = ctk.CTkFrame(parent, fg_color=COLOR_BG_SIDEBAR, corner_radius=15)
         card.grid(row=0, column=col_idx, sticky="ew", padx=10)
@@ -339,25 +329,103 @@ class InventoryApp(ctk.CTk):
         entry_name = ctk.CTkEntry(form_card, placeholder_text="Mouse, MO-001", height=45, border_width=0, fg_color=COLOR_BG_MAIN)
         entry_name.pack(fill="x", padx=30, pady=(0, 20))
 
+        # Saran autocomplete; tombol dipakai ulang, hanya teks dan visibilitasnya yang berubah.
+        suggest_frame = ctk.CTkFrame(form_card, fg_color="transparent")
+        suggest_buttons = []
+        for _ in range(SUGGEST_LIMIT):
+            btn = ctk.CTkButton(suggest_frame, text="", anchor="w", height=30, fg_color=COLOR_BG_MAIN, hover_color=COLOR_ACCENT)
+            suggest_buttons.append(btn)
+        suggest = {"entry": entry_name, "frame": suggest_frame, "buttons": suggest_buttons, "job": None}
+        entry_name.bind("<KeyRelease>", lambda event: self.on_suggest_key(suggest, event))
+
         ctk.CTkLabel(form_card, text="Quantity", text_color=COLOR_TEXT_GRAY).pack(anchor="w", padx=30, pady=(0, 10))
         entry_qty = ctk.CTkEntry(form_card, placeholder_text="1", height=45, border_width=0, fg_color=COLOR_BG_MAIN)
         entry_qty.pack(fill="x", padx=30, pady=(0, 30))
 
         btn_text = "Confirm Stock In" if page_name == "StockIn" else "Confirm Stock Out"
         ctk.CTkButton(frame, text=btn_text, fg_color=theme_color, height=55, font=ctk.CTkFont(size=16, weight="bold"),
-                      command=lambda: action_command(entry_name, entry_qty)).pack(fill="x", pady=20)
+                      command=lambda: (self.hide_suggestions(suggest), action_command(entry_name, entry_qty, suggest))).pack(fill="x", pady=20)
+
+        kind = "in" if page_name == "StockIn" else "out"
+        ctk.CTkButton(frame, text="Import Batch (CSV / JSON)", fg_color=COLOR_BG_SIDEBAR, height=45,
+                      command=lambda: self.action_import_batch(kind)).pack(fill="x")
+
+    def on_suggest_key(self, suggest, event=None):
+        if event is not None and event.keysym in ("Return", "Tab", "Escape"):
+            self.hide_suggestions(suggest)
+            return
+        if suggest["job"]:
+            self.after_cancel(suggest["job"])
+        suggest["job"] = self.after(SUGGEST_DEBOUNCE_MS, lambda: self.show_suggestions(suggest))
+
+    @perf.timed("suggest_items")
+    def show_suggestions(self, suggest):
+        suggest["job"] = None
+        query = suggest["entry"].get().strip()
+        if not query or not self.system.loaded.is_set():
+            self.hide_suggestions(suggest)
+            return
+
+        items = self.system.rank_items(query, SUGGEST_LIMIT)
+        # SKU persis sudah benar, tidak perlu saran.
+        if not items or (len(items) == 1 and items[0].sku.lower() == query.lower()):
+            self.hide_suggestions(suggest)
+            return
+
+        for i, btn in enumerate(suggest["buttons"]):
+            if i < len(items):
+                item = items[i]
+                btn.configure(text=f"{item.sku} — {item.name} (stok {item.stock})",
+                              command=lambda sku=item.sku: self.pick_suggestion(suggest, sku))
+                btn.pack(fill="x", pady=(0, 4))
+            else:
+                btn.pack_forget()
+        suggest["frame"].pack(fill="x", padx=30, pady=(0, 20), after=suggest["entry"])
+
+    def hide_suggestions(self, suggest):
+        if suggest["job"]:
+            self.after_cancel(suggest["job"])
+            suggest["job"] = None
+        suggest["frame"].pack_forget()
+
+    def pick_suggestion(self, suggest, sku):
+        suggest["entry"].delete(0, 'end')
+        suggest["entry"].insert(0, sku)
+        self.hide_suggestions(suggest)
 
     def on_search_key(self, event=None):
+        if self.search_job:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self.run_search)
+
+    def run_search(self, event=None):
+        if self.search_job:
+            self.after_cancel(self.search_job)
+            self.search_job = None
+
+        query = self.search_bar.get().strip().lower()
+        if query == self.last_query:
+            return
+        self.last_query = query
+        self.inventory_page = 0
+        self.refresh_data()
+
+    def change_inventory_page(self, step):
+        self.inventory_page = max(0, self.inventory_page + step)
         self.refresh_data()
 
+    @perf.timed("show_frame")
     def show_frame(self, page_name):
         for frame in self.frames.values(): frame.grid_forget()
         self.frames[page_name].grid(row=0, column=0, sticky="nsew")
+        self.current_page = page_name
         self.update_sidebar_active_state(page_name)
         self.refresh_data()
+        if page_name == "Scanner":
+            self.scan_entry.focus_set()
 
     def update_sidebar_active_state(self, page_name):
-        btns = [self.btn_dash, self.btn_inv, self.btn_in, self.btn_out]
+        btns = [self.btn_dash, self.btn_inv, self.btn_in, self.btn_out, self.btn_analytics, self.btn_scanner]
         for btn in btns:
             btn.configure(fg_color="transparent", text_color=COLOR_TEXT_GRAY)
 
@@ -365,92 +433,271 @@ class InventoryApp(ctk.CTk):
         elif page_name == "Inventory": self.btn_inv.configure(fg_color=COLOR_ACCENT, text_color=COLOR_TEXT_WHITE)
         elif page_name == "StockIn": self.btn_in.configure(fg_color=COLOR_ACCENT, text_color=COLOR_TEXT_WHITE)
         elif page_name == "StockOut": self.btn_out.configure(fg_color=COLOR_ACCENT, text_color=COLOR_TEXT_WHITE)
+        elif page_name == "Analytics": self.btn_analytics.configure(fg_color=COLOR_ACCENT, text_color=COLOR_TEXT_WHITE)
+        elif page_name == "Scanner": self.btn_scanner.configure(fg_color=COLOR_ACCENT, text_color=COLOR_TEXT_WHITE)
+
+    def on_system_change(self, event, payload):
+        if event == "stats":
+            self.update_cards(payload)
+        elif event == "item":
+            self.refresh_changed_rows(payload)
+
+    def refresh_changed_rows(self, record):
+        if record["op"] in ("add", "del", "threshold") or self.current_page == "Analytics":
+            self.refresh_data()
+            return
 
+        # Stock in/out hanya mengubah angka; cukup baris yang sedang tampil dan terkena record ini.
+        skus = {sku for sku, _ in record["moves"]} if record["op"] == "batch" else {record["sku"]}
+        for row in self.inventory_rows:
+            if row["visible"] and row["sku"] in skus:
+                item = self.system.get_item(row["sku"])
+                if item:
+                    self.update_inventory_row(row, item)
+        self.render_activity()
+
+    def update_cards(self, stats):
+        cards = {
+            "total_units": (self.card_total, lambda v: f"{v:,}"),
+            "low_stock": (self.card_low, str),
+            "daily_in": (self.card_in, lambda v: f"+{v}"),
+            "daily_out": (self.card_out, lambda v: f"-{v}"),
+        }
+        for key, value in stats.items():
+            if key in cards and self.card_values.get(key) != value:
+                card, fmt = cards[key]
+                card.value_label.configure(text=fmt(value))
+                self.card_values[key] = value
+
+    @perf.timed("refresh_data")
     def refresh_data(self):
-        total = sum(item.stock for item in self.system.items)
-        low = sum(1 for item in self.system.items if item.stock < 10)
-        in_today = self.system.daily_in
-        out_today = self.system.daily_out
-        self.system.save_data()
-
-        self.card_total.value_label.configure(text=f"{total:,}")
-        self.card_low.value_label.configure(text=str(low))
-        self.card_in.value_label.configure(text=f"+{in_today}")
-        self.card_out.value_label.configure(text=f"-{out_today}")
-
-        for widget in self.activity_frame.winfo_children(): widget.destroy()
-        if not self.system.recent_activity:
-            ctk.CTkLabel(self.activity_frame, text="No recent activity.", text_color=COLOR_TEXT_GRAY).pack(pady=20)
-        else:
-            for act in self.system.recent_activity:
-                row = ctk.CTkFrame(self.activity_frame, fg_color="transparent")
-                row.pack(fill="x", padx=20, pady=10)
-                ctk.CTkLabel(row, text=act['text'], text_color=COLOR_TEXT_WHITE).pack(side="left")
+        self.render_activity()
+        if self.current_page == "Analytics":
+            self.render_analytics()
 
-        for widget in self.scroll_inv.winfo_children(): widget.destroy()
+        # Tabel inventory hanya dirender saat halamannya terlihat.
+        if self.current_page != "Inventory":
+            return
 
-        query = ""
-        if hasattr(self, "search_bar"):
-            query = self.search_bar.get().strip().lower()
+        query = self.search_bar.get().strip().lower()
+        items_to_show = self.system.search_items(query)
+        if query and not items_to_show:
+            # Tidak ada yang cocok persis: tampilkan hasil yang mirip (typo).
+            items_to_show = self.system.rank_items(query, INVENTORY_PAGE_SIZE)
+        self.render_inventory_rows(items_to_show)
 
-        if query:
-            items_to_show = [item for item in self.system.items if query in item.name.lower() or query in item.sku.lower()]
+    def render_analytics(self):
+        if not self.system.loaded.is_set():
+            return
+        # Report di-cache oleh InventoryAnalytics sampai ada perubahan item.
+        report = self.analytics.report()
+        if report is self.analytics_shown:
+            return
+        self.analytics_shown = report
+        self.analytics_text.configure(state="normal")
+        self.analytics_text.delete("1.0", "end")
+        self.analytics_text.insert("1.0", format_report(report))
+        self.analytics_text.configure(state="disabled")
+
+    def render_scanner(self):
+        # Hanya digambar ulang kalau angka / daftar berubah, supaya scan cepat tidak membebani UI.
+        state = (tuple(self.scanner.totals.values()), len(self.scanner.pending), self.scanner.kind,
+                 tuple(self.scanner.recent), tuple(self.scanner.errors))
+        if state == self.scanner_shown:
+            return
+        self.scanner_shown = state
+
+        pending = sum(self.scanner.pending.values())
+        self.lbl_scan_totals.configure(text=format_totals(self.scanner.totals, self.scanner.kind) + (f" | Menunggu {pending}" if pending else ""))
+
+        top = sorted(self.scanner.by_sku.items(), key=lambda entry: -entry[1])[:10]
+        lines = ["Terbanyak:"] + [f"  {sku:<16} {qty:>7,}" for sku, qty in top]
+        lines += ["", "Terakhir:"] + [f"  {text}" for text in reversed(self.scanner.recent)]
+        if self.scanner.errors:
+            lines += ["", "Masalah:"] + [f"  {text}" for text in reversed(self.scanner.errors)]
+        self.scan_text.configure(state="normal")
+        self.scan_text.delete("1.0", "end")
+        self.scan_text.insert("1.0", "\n".join(lines))
+        self.scan_text.configure(state="disabled")
+
+    def on_scan(self, event=None):
+        code = self.scan_entry.get()
+        self.scan_entry.delete(0, 'end')
+        # Selama data masih dimuat scan tetap antre; diterapkan setelah load selesai.
+        self.scanner.feed_line(code)
+        return "break"
+
+    def action_scan_kind(self, value):
+        self.scanner.set_kind("in" if value == "Stock In" else "out")
+        self.scan_entry.focus_set()
+
+    def action_open_scan_feed(self):
+        if not self.ensure_loaded(): return
+        path = filedialog.askopenfilename(title="Feed Scanner", filetypes=[("Scan feed", "*.txt *.csv *.log"), ("All files", "*.*")])
+        if path:
+            self.scanner.start_reader(path)
+        self.scan_entry.focus_set()
+
+    def action_export_analytics(self):
+        if not self.ensure_loaded(): return
+        path = filedialog.asksaveasfilename(title="Export Analytics", defaultextension=".csv", filetypes=[("CSV", "*.csv")])
+        if not path:
+            return
+        try:
+            count = self.analytics.export_csv(path)
+        except OSError as e:
+            messagebox.showerror("Export Gagal", str(e))
+            return
+        messagebox.showinfo("Success", f"{count:,} item diekspor ke {path}")
+
+    @perf.timed("render_activity")
+    def render_activity(self):
+        activities = self.system.recent_activity
+        if not activities:
+            self.activity_empty.pack(pady=20)
         else:
-            items_to_show = list(self.system.items)
-
-        for item in items_to_show:
-            row = ctk.CTkFrame(self.scroll_inv, fg_color=COLOR_BG_SIDEBAR, corner_radius=10)
-            row.pack(fill="x", pady=5, padx=15)
-            for i in range(7): 
-                if i == 0:
-                    row.grid_columnconfigure(i, weight=2, uniform="cols")
-                else:
-                    row.grid_columnconfigure(i, weight=1, uniform="cols")
-
-            ctk.CTkLabel(row, text=item.name, font=ctk.CTkFont(weight="bold"), anchor="w").grid(row=0, column=0, sticky="ew", padx=15, pady=15)
-            ctk.CTkLabel(row, text=item.sku, text_color=COLOR_TEXT_GRAY, anchor="w").grid(row=0, column=1, sticky="ew", padx=5)
-            ctk.CTkLabel(row, text=item.category, anchor="w").grid(row=0, column=2, sticky="ew", padx=35)
-            ctk.CTkLabel(row, text=str(item.stock), anchor="w").grid(row=0, column=3, sticky="ew", padx=30)
-            ctk.CTkLabel(row, text=f"Rp{item.price:,}", anchor="w").grid(row=0, column=4, sticky="ew", padx=20)
-
-            status_color = COLOR_SUCCESS if item.stock > 20 else COLOR_WARNING if item.stock > 0 else COLOR_DANGER
-            status_text = "In Stock" if item.stock > 20 else "Low Stock" if item.stock > 0 else "Out of Stock"
-            badge = ctk.CTkFrame(row, fg_color=status_color, corner_radius=15, height=25)
-            badge.grid(row=0, column=5, sticky="ew", padx=20)
-            ctk.CTkLabel(badge, text=status_text, font=ctk.CTkFont(size=8), text_color=COLOR_BG_MAIN).pack(padx=10, pady=2)
-
-            action_frame = ctk.CTkFrame(row, fg_color="transparent")
-            action_frame.grid(row=0, column=6, sticky="ew", padx=30)
-            ctk.CTkButton(action_frame, text="Hapus", font=ctk.CTkFont(size=10), width=40, fg_color=COLOR_BG_MAIN, hover_color=COLOR_DANGER, command=lambda n=item.name: self.action_delete(n)).pack()
-            
-
-    def action_stock_in(self, entry_name, entry_qty):
+            self.activity_empty.pack_forget()
+
+        while len(self.activity_rows) < len(activities):
+            label = ctk.CTkLabel(self.activity_frame, text="", text_color=COLOR_TEXT_WHITE)
+            self.activity_rows.append({"label": label, "text": None, "visible": False})
+
+        for i, row in enumerate(self.activity_rows):
+            if i < len(activities):
+                if row["text"] != activities[i]['text']:
+                    row["label"].configure(text=activities[i]['text'])
+                    row["text"] = activities[i]['text']
+                if not row["visible"]:
+                    row["label"].pack(anchor="w", padx=20, pady=10)
+                    row["visible"] = True
+            elif row["visible"]:
+                row["label"].pack_forget()
+                row["visible"] = False
+
+    @perf.timed("create_inventory_row")
+    def create_inventory_row(self):
+        frame = ctk.CTkFrame(self.scroll_inv, fg_color=COLOR_BG_SIDEBAR, corner_radius=10)
+        for i in range(7): 
+            if i == 0:
+                frame.grid_columnconfigure(i, weight=2, uniform="cols")
+            else:
+                frame.grid_columnconfigure(i, weight=1, uniform="cols")
+
+        row = {"frame": frame, "values": {}, "sku": None, "visible": False}
+        row["name"] = ctk.CTkLabel(frame, text="", font=self.fonts["row_name"], anchor="w")
+        row["name"].grid(row=0, column=0, sticky="ew", padx=15, pady=15)
+        row["sku_label"] = ctk.CTkLabel(frame, text="", text_color=COLOR_TEXT_GRAY, anchor="w")
+        row["sku_label"].grid(row=0, column=1, sticky="ew", padx=5)
+        row["category"] = ctk.CTkLabel(frame, text="", anchor="w")
+        row["category"].grid(row=0, column=2, sticky="ew", padx=35)
+        row["stock"] = ctk.CTkLabel(frame, text="", anchor="w")
+        row["stock"].grid(row=0, column=3, sticky="ew", padx=30)
+        row["price"] = ctk.CTkLabel(frame, text="", anchor="w")
+        row["price"].grid(row=0, column=4, sticky="ew", padx=20)
+
+        row["badge"] = ctk.CTkFrame(frame, corner_radius=15, height=25)
+        row["badge"].grid(row=0, column=5, sticky="ew", padx=20)
+        row["status"] = ctk.CTkLabel(row["badge"], text="", font=self.fonts["badge"], text_color=COLOR_BG_MAIN)
+        row["status"].pack(padx=10, pady=2)
+
+        action_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        action_frame.grid(row=0, column=6, sticky="ew", padx=30)
+        ctk.CTkButton(action_frame, text="Hapus", font=self.fonts["action"], width=40, fg_color=COLOR_BG_MAIN, hover_color=COLOR_DANGER, command=lambda: self.action_delete(row["sku"])).pack()
+        return row
+
+    def update_inventory_row(self, row, item):
+        # Sama dengan hitungan kartu Low Stock: threshold per item / kategori dari reorder engine.
+        status_color, status_text = STOCK_STATUS[self.system.stock_status(item)]
+        values = {
+            "name": item.name,
+            "sku_label": item.sku,
+            "category": item.category,
+            "stock": str(item.stock),
+            "price": f"Rp{item.price:,}",
+            "status": status_text,
+        }
+
+        row["sku"] = item.sku
+        for key, text in values.items():
+            if row["values"].get(key) != text:
+                row[key].configure(text=text)
+        if row["values"].get("status") != status_text:
+            row["badge"].configure(fg_color=status_color)
+        row["values"] = values
+
+    @perf.timed("render_inventory_rows")
+    def render_inventory_rows(self, items_to_show):
+        total_pages = max(1, -(-len(items_to_show) // INVENTORY_PAGE_SIZE))
+        self.inventory_page = min(self.inventory_page, total_pages - 1)
+        start = self.inventory_page * INVENTORY_PAGE_SIZE
+        page_items = items_to_show[start:start + INVENTORY_PAGE_SIZE]
+
+        while len(self.inventory_rows) < len(page_items):
+            self.inventory_rows.append(self.create_inventory_row())
+
+        for i, row in enumerate(self.inventory_rows):
+            if i < len(page_items):
+                self.update_inventory_row(row, page_items[i])
+                if not row["visible"]:
+                    row["frame"].pack(fill="x", pady=5, padx=15)
+                    row["visible"] = True
+            elif row["visible"]:
+                row["frame"].pack_forget()
+                row["visible"] = False
+
+        self.lbl_page.configure(text=f"Page {self.inventory_page + 1}/{total_pages} ({len(items_to_show):,} items)")
+
+    def resolve_transaction_item(self, entry_name, suggest):
+        # Nama sebagian yang cocok dengan beberapa barang tidak ditebak; kandidatnya ditampilkan.
+        item = self.system.search_item(entry_name.get())
+        if item is None:
+            self.show_suggestions(suggest)
+            messagebox.showerror("Error", self.system.last_error)
+        return item
+
+    def action_stock_in(self, entry_name, entry_qty, suggest):
+        if not self.ensure_loaded(): return
         name = entry_name.get(); qty = entry_qty.get()
         if name and qty.isdigit():
-            if self.system.add_stock(name, int(qty)):
-                messagebox.showinfo("Success", f"Stok {name} berhasil ditambah ke Queue!")
+            item = self.resolve_transaction_item(entry_name, suggest)
+            if item is None: return
+            if self.system.add_stock(item.sku, int(qty)):
+                messagebox.showinfo("Success", f"Stok {item.sku} - {item.name} berhasil ditambah!")
                 entry_name.delete(0, 'end'); entry_qty.delete(0, 'end')
-                self.refresh_data()
-                self.system.save_data()
-            else: messagebox.showerror("Error", "Barang tidak ditemukan!")
+            else: messagebox.showerror("Error", self.system.last_error or "Barang tidak ditemukan!")
         else: messagebox.showwarning("Invalid", "Cek inputan nama dan jumlah.")
 
-    def action_stock_out(self, entry_name, entry_qty):
+    def action_stock_out(self, entry_name, entry_qty, suggest):
+        if not self.ensure_loaded(): return
         name = entry_name.get(); qty = entry_qty.get()
         if name and qty.isdigit():
-            if self.system.remove_stock(name, int(qty)):
-                messagebox.showinfo("Success", f"Stok {name} berhasil dikurangi (Stack Push)!")
+            item = self.resolve_transaction_item(entry_name, suggest)
+            if item is None: return
+            if self.system.remove_stock(item.sku, int(qty)):
+                messagebox.showinfo("Success", f"Stok {item.sku} - {item.name} berhasil dikurangi!")
                 entry_name.delete(0, 'end'); entry_qty.delete(0, 'end')
-                self.refresh_data()
-                self.system.save_data()
-            else: messagebox.showerror("Error", "Barang tidak ditemukan atau stok habis!")
+            else: messagebox.showerror("Error", self.system.last_error or "Barang tidak ditemukan atau stok habis!")
         else: messagebox.showwarning("Invalid", "Cek inputan nama dan jumlah.")
 
-    def action_delete(self, name):
-        if messagebox.askyesno("Confirm Delete", f"Yakin menghapus '{name}'?"):
-            self.system.delete_item(name)
-            self.refresh_data()
-            self.system.save_data()
+    def action_import_batch(self, kind):
+        if not self.ensure_loaded(): return
+        path = filedialog.askopenfilename(title="Import Batch", filetypes=[("Batch file", "*.csv *.json *.jsonl"), ("All files", "*.*")])
+        if not path:
+            return
+
+        ok, errors = self.system.import_movements(path, kind)
+        if ok:
+            messagebox.showinfo("Success", "Batch berhasil diproses.")
+        else:
+            more = f"\n... dan {len(errors) - 10} error lainnya" if len(errors) > 10 else ""
+            messagebox.showerror("Batch Ditolak", "Tidak ada perubahan stok:\n" + "\n".join(errors[:10]) + more)
+
+    def action_delete(self, sku):
+        if not self.ensure_loaded(): return
+        item = self.system.get_item(sku)
+        if item and messagebox.askyesno("Confirm Delete", f"Yakin menghapus '{item.name}'?"):
+            if not self.system.delete_item(sku):
+                messagebox.showerror("Error", self.system.last_error or "Barang gagal dihapus.")
 
     def popup_add_item(self):
         popup = ctk.CTkToplevel(self)
@@ -481,6 +728,7 @@ class InventoryApp(ctk.CTk):
         
 
         def submit():
+            if not self.ensure_loaded(): return
             name = entry_name.get()
             cat = entry_cat.get()
             price = entry_price.get()
@@ -490,9 +738,9 @@ class InventoryApp(ctk.CTk):
                 messagebox.showerror("Error", "Isi semua data dengan benar.")
                 return
 
-            self.system.add_item(name, cat, int(price), int(stock))
-            self.refresh_data()
-            self.system.save_data()
+            if not self.system.add_item(name, cat, int(price), int(stock)):
+                messagebox.showerror("Error", self.system.last_error or "Barang gagal ditambahkan, coba lagi.")
+                return
             messagebox.showinfo("Success", "Barang ditambahkan!")
             popup.destroy()
 
@@ -0,0 +1,154 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+from inventory_core import InventorySystem
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+CATEGORY_COUNT = 200
+SAMPLES = 200
+REGRESSION_THRESHOLD = 1.25
+
+PRODUCT_WORDS = ["Mouse", "Keyboard", "Headset", "Charger", "Cable", "Case", "Powerbank", "Speaker", "Stand", "Adapter"]
+BRAND_WORDS = ["Nova", "Orion", "Pixel", "Vertex", "Zen", "Aero", "Flux", "Luma"]
+
+def generate_catalog(data_dir, size, seed=42):
+    rng = random.Random(seed)
+    categories = [f"Category {i:03d}" for i in range(CATEGORY_COUNT)]
+    path = os.path.join(data_dir, "inventory_data.json")
+    names = []
+
+    # Ditulis per item supaya katalog 1M tidak perlu dibangun utuh di memory.
+    with open(path, "w") as f:
+        f.write('{"date": "%s", "daily_in": 0, "daily_out": 0, "recent_activity": [], "items": [' % date.today())
+        for n in range(size):
+            category = categories[n % CATEGORY_COUNT]
+            name = f"{rng.choice(BRAND_WORDS)} {rng.choice(PRODUCT_WORDS)} {n}"
+            item = {"name": name, "sku": f"C{n % CATEGORY_COUNT:03d}-{n:07d}", "category": category,
+                    "price": rng.randrange(10000, 2000000, 500), "stock": rng.randrange(0, 200)}
+            f.write(("," if n else "") + json.dumps(item))
+            if len(names) < SAMPLES * 5:
+                names.append(name)
+        f.write("]}")
+    return names
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def summarize(samples):
+    return {"p50_ms": round(percentile(samples, 50), 4), "p99_ms": round(percentile(samples, 99), 4), "samples": len(samples)}
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+def bench_size(size, workdir, repeat_slow):
+    data_dir = os.path.join(workdir, str(size))
+    os.makedirs(data_dir)
+    names = generate_catalog(data_dir, size)
+    rng = random.Random(size)
+    result = {}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        InventorySystem("json", data_dir)
+        result["peak_memory_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+        tracemalloc.stop()
+
+        result["load_data"] = summarize([timed(InventorySystem, "json", data_dir) for _ in range(repeat_slow)])
+        system = InventorySystem("json", data_dir)
+        result["save_data"] = summarize([timed(system.save_data) for _ in range(repeat_slow)])
+
+        # Snapshot biner dari katalog yang sama; load pertama di sini sekaligus migrasi dari JSON.
+        binary = InventorySystem("binary", data_dir)
+        binary.close()
+        result["load_data_binary"] = summarize([timed(InventorySystem, "binary", data_dir) for _ in range(repeat_slow)])
+        result["save_data_binary"] = summarize([timed(binary.save_data) for _ in range(repeat_slow)])
+        result["lookup_binary"] = summarize([timed(binary.storage.lookup, name) for name in [item.sku for item in system.items[:SAMPLES]]])
+
+        skus = [item.sku for item in rng.sample(system.items, min(SAMPLES, size))]
+        fragments = [name.split()[1].lower()[1:] + " " + name.split()[2][:2] for name in names[:SAMPLES]]
+        result["search_item_sku"] = summarize([timed(system.search_item, sku) for sku in skus])
+        result["search_item_name"] = summarize([timed(system.search_item, name) for name in names[:SAMPLES]])
+        result["search_item_substring"] = summarize([timed(system.search_item, text) for text in fragments])
+
+        stock_samples = []
+        for sku in skus:
+            stock_samples.append(timed(system.add_stock, sku, 5))
+            stock_samples.append(timed(system.remove_stock, sku, 5))
+        result["stock_movement"] = summarize(stock_samples)
+
+        result["dashboard_stats"] = summarize([timed(system.dashboard_stats) for _ in range(SAMPLES)])
+        result["delete_item"] = summarize([timed(system.delete_item, sku) for sku in skus[:SAMPLES // 4]])
+
+    return result
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for size, ops in results.items():
+        for op, stats in ops.items():
+            old = baseline.get(size, {}).get(op)
+            if not isinstance(stats, dict) or not old:
+                continue
+            for key in ("p50_ms", "p99_ms"):
+                # Di bawah 0.05 ms selisihnya lebih banyak noise daripada regresi.
+                if stats[key] > max(old[key] * threshold, 0.05):
+                    regressions.append(f"{size} {op} {key}: {old[key]} -> {stats[key]}")
+    return regressions
+
+def print_table(results):
+    print(f"{'size':>9}  {'operation':<22} {'p50 ms':>10} {'p99 ms':>10}")
+    for size, ops in results.items():
+        for op, stats in ops.items():
+            if isinstance(stats, dict):
+                print(f"{size:>9}  {op:<22} {stats['p50_ms']:>10} {stats['p99_ms']:>10}")
+        print(f"{size:>9}  {'peak memory (MB)':<22} {ops['peak_memory_mb']:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hot path InventorySystem tanpa GUI.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES))
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="file hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    workdir = tempfile.mkdtemp(prefix="inventory-bench-")
+    results = {}
+    try:
+        for size in sizes:
+            print(f"Benchmark {size:,} item...")
+            results[str(size)] = bench_size(size, workdir, 3 if size <= 100000 else 1)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_table(results)
+    with open(args.output, "w") as f:
+        json.dump({"python": platform.python_version(), "date": str(date.today()), "results": results}, f, indent=4)
+    print(f"Hasil disimpan ke {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Regresi terdeteksi:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("Tidak ada regresi terhadap baseline.")
+
+if __name__ == "__main__":
+    main()
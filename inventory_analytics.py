@@ -0,0 +1,212 @@
+import csv
+from datetime import date, timedelta
+
+from inventory_perf import perf
+
+try:
+    import numpy as np
+except ImportError:
+    # Tanpa numpy laporan tetap jalan dengan loop Python, hanya lebih lambat di catalog besar.
+    np = None
+
+SALES_WINDOW_DAYS = 30
+ABC_LIMITS = (0.8, 0.95)
+
+class Columns:
+    # Satu snapshot kolom dari item store; index baris sama untuk semua kolom.
+    def __init__(self, items, categories, sold):
+        self.skus = [item.sku for item in items]
+        self.names = [item.name for item in items]
+        self.categories = categories
+        codes = {category: i for i, category in enumerate(categories)}
+        count = len(items)
+        if np is not None:
+            self.category = np.fromiter((codes[item.category] for item in items), dtype=np.int32, count=count)
+            self.price = np.fromiter((item.price for item in items), dtype=np.int64, count=count)
+            self.stock = np.fromiter((item.stock for item in items), dtype=np.int64, count=count)
+            self.sold = np.fromiter((sold.get(item.sku, 0) for item in items), dtype=np.int64, count=count)
+            self.value = self.price * self.stock
+        else:
+            self.category = [codes[item.category] for item in items]
+            self.price = [item.price for item in items]
+            self.stock = [item.stock for item in items]
+            self.sold = [sold.get(item.sku, 0) for item in items]
+            self.value = [price * stock for price, stock in zip(self.price, self.stock)]
+
+class InventoryAnalytics:
+    def __init__(self, system, window_days=SALES_WINDOW_DAYS):
+        self.system = system
+        self.window_days = window_days
+        self.columns = None
+        self.cached_report = None
+        system.subscribe(self.on_change)
+
+    def on_change(self, event, payload):
+        # Setiap record yang diterapkan mengubah stok / daftar item; kolom dibangun ulang saat dibutuhkan.
+        if event == "item":
+            self.columns = None
+            self.cached_report = None
+
+    def sales_by_sku(self):
+        start = date.today() - timedelta(days=self.window_days - 1)
+        sold = {}
+        for _, totals in self.system.ledger.iter_days(start):
+            for sku, qty in totals["out"]["sku"].items():
+                sold[sku] = sold.get(sku, 0) + qty
+        return sold
+
+    @perf.timed("analytics_columns")
+    def get_columns(self):
+        # Tidak perlu invalidasi saat berganti hari: window penjualan ikut bergeser lewat ledger.
+        if self.columns is None:
+            with self.system.lock:
+                items = list(self.system.items)
+                categories = sorted(self.system.category_stats)
+            self.columns = Columns(items, categories, self.sales_by_sku())
+        return self.columns
+
+    def abc_classes(self, values):
+        # A = item bernilai terbesar sampai 80% total nilai, B sampai 95%, sisanya C.
+        if np is not None:
+            order = np.argsort(-values, kind="stable")
+            total = values.sum()
+            before = (np.cumsum(values[order]) - values[order]) / total if total else np.zeros(len(order))
+            ranks = np.searchsorted(np.array(ABC_LIMITS), before, side="right")
+            classes = np.empty(len(order), dtype=np.int8)
+            classes[order] = ranks
+            return classes
+
+        order = sorted(range(len(values)), key=lambda i: -values[i])
+        total = sum(values)
+        classes = [0] * len(values)
+        running = 0
+        for i in order:
+            share = running / total if total else 0
+            classes[i] = 0 if share < ABC_LIMITS[0] else 1 if share < ABC_LIMITS[1] else 2
+            running += values[i]
+        return classes
+
+    @perf.timed("analytics_report")
+    def report(self):
+        if self.cached_report is not None:
+            return self.cached_report
+
+        cols = self.get_columns()
+        classes = self.abc_classes(cols.value)
+        count = len(cols.categories)
+        if np is not None:
+            value = np.bincount(cols.category, weights=cols.value, minlength=count)
+            units = np.bincount(cols.category, weights=cols.stock, minlength=count)
+            sold = np.bincount(cols.category, weights=cols.sold, minlength=count)
+            items = np.bincount(cols.category, minlength=count)
+            abc_items = np.bincount(classes, minlength=3)
+            abc_value = np.bincount(classes, weights=cols.value, minlength=3)
+            total_sold = int(cols.sold.sum())
+            total_units = int(cols.stock.sum())
+        else:
+            value, units, sold, items = [0] * count, [0] * count, [0] * count, [0] * count
+            for code, item_value, stock, item_sold in zip(cols.category, cols.value, cols.stock, cols.sold):
+                value[code] += item_value
+                units[code] += stock
+                sold[code] += item_sold
+                items[code] += 1
+            abc_items, abc_value = [0] * 3, [0] * 3
+            for cls, item_value in zip(classes, cols.value):
+                abc_items[cls] += 1
+                abc_value[cls] += item_value
+            total_sold = sum(cols.sold)
+            total_units = sum(cols.stock)
+
+        total_value = int(sum(value))
+        categories = []
+        for i, category in enumerate(cols.categories):
+            categories.append({
+                "category": category,
+                "items": int(items[i]),
+                "units": int(units[i]),
+                "value": int(value[i]),
+                "share": int(value[i]) / total_value if total_value else 0,
+                "sold": int(sold[i]),
+                "sell_through": sell_through(int(sold[i]), int(units[i])),
+                "days_of_cover": days_of_cover(int(units[i]), int(sold[i]), self.window_days),
+            })
+        categories.sort(key=lambda row: -row["value"])
+
+        self.cached_report = {
+            "date": str(date.today()),
+            "window_days": self.window_days,
+            "items": len(cols.skus),
+            "total_value": total_value,
+            "sold": total_sold,
+            "sell_through": sell_through(total_sold, total_units),
+            "days_of_cover": days_of_cover(total_units, total_sold, self.window_days),
+            "abc": {
+                label: {"items": int(abc_items[i]), "value": int(abc_value[i])}
+                for i, label in enumerate("ABC")
+            },
+            "categories": categories,
+        }
+        return self.cached_report
+
+    def item_rows(self):
+        cols = self.get_columns()
+        classes = self.abc_classes(cols.value)
+        for i, sku in enumerate(cols.skus):
+            stock, sold = int(cols.stock[i]), int(cols.sold[i])
+            yield {
+                "sku": sku,
+                "name": cols.names[i],
+                "category": cols.categories[int(cols.category[i])],
+                "price": int(cols.price[i]),
+                "stock": stock,
+                "value": int(cols.value[i]),
+                "abc": "ABC"[int(classes[i])],
+                "sold": sold,
+                "sell_through": round(sell_through(sold, stock), 4),
+                "days_of_cover": days_of_cover(stock, sold, self.window_days),
+            }
+
+    @perf.timed("analytics_export")
+    def export_csv(self, path):
+        fields = ["sku", "name", "category", "price", "stock", "value", "abc", "sold", "sell_through", "days_of_cover"]
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            count = 0
+            for row in self.item_rows():
+                if row["days_of_cover"] is not None:
+                    row["days_of_cover"] = round(row["days_of_cover"], 1)
+                writer.writerow(row)
+                count += 1
+        return count
+
+def sell_through(sold, on_hand):
+    return sold / (sold + on_hand) if sold + on_hand else 0
+
+def days_of_cover(on_hand, sold, window_days):
+    # None = belum ada penjualan di window, jadi stok tidak akan habis dengan laju sekarang.
+    if not sold:
+        return None
+    return on_hand / (sold / window_days)
+
+def format_report(report):
+    lines = [
+        f"Nilai inventory   : Rp{report['total_value']:,} ({report['items']:,} item)",
+        f"{'Terjual ' + str(report['window_days']) + ' hari':<18}: {report['sold']:,} unit, sell-through {report['sell_through']:.1%}",
+        f"Days of cover     : {format_cover(report['days_of_cover'])}",
+        "",
+        f"{'ABC':<5} {'items':>9} {'value':>18} {'share':>7}",
+    ]
+    for label, row in report["abc"].items():
+        share = row["value"] / report["total_value"] if report["total_value"] else 0
+        lines.append(f"{label:<5} {row['items']:>9,} {'Rp' + format(row['value'], ','):>18} {share:>7.1%}")
+    lines += ["", f"{'category':<22} {'items':>7} {'units':>9} {'value':>18} {'share':>7} {'sold':>7} {'sell-thr':>8} {'cover':>8}"]
+    for row in report["categories"]:
+        lines.append(
+            f"{row['category'][:22]:<22} {row['items']:>7,} {row['units']:>9,} {'Rp' + format(row['value'], ','):>18} "
+            f"{row['share']:>7.1%} {row['sold']:>7,} {row['sell_through']:>8.1%} {format_cover(row['days_of_cover']):>8}"
+        )
+    return "\n".join(lines)
+
+def format_cover(days):
+    return "-" if days is None else f"{days:.1f} hr"
@@ -0,0 +1,260 @@
+import argparse
+import json
+import os
+import shlex
+import sys
+import time
+
+from inventory_core import InventorySystem
+from inventory_scanner import COALESCE_WINDOW_MS, SCAN_POLL_MS, ScanSession, format_totals
+
+def cmd_stock(system, args, kind):
+    if not args.qty.isdigit() or int(args.qty) <= 0:
+        print(f"Jumlah tidak valid: {args.qty}")
+        return 1
+
+    # Nama sebagian yang cocok dengan beberapa barang ditolak; last_error berisi kandidatnya.
+    item = system.search_item(args.item)
+    if item is None:
+        print(system.last_error)
+        return 1
+    if kind == "in":
+        ok = system.add_stock(item.sku, int(args.qty))
+    else:
+        ok = system.remove_stock(item.sku, int(args.qty))
+
+    if not ok:
+        print(system.last_error or ("Barang tidak ditemukan atau stok habis!" if kind == "out" else "Barang tidak ditemukan!"))
+        return 1
+    item = system.get_item(item.sku)
+    print(f"{item.sku}\t{item.name}\tstock={item.stock}")
+    return 0
+
+def print_item(sku, name, category, stock, price):
+    print(f"{sku}\t{name}\t{category}\tstock={stock}\tprice={price}")
+
+def cmd_query(system, args):
+    # SKU persis dijawab langsung dari snapshot biner (mmap) tanpa load seluruh katalog.
+    if not system.loaded.is_set():
+        lookup = getattr(system.storage, "lookup", None)
+        item = lookup(args.text) if lookup else None
+        if item:
+            print_item(item["sku"], item["name"], item["category"], item["stock"], item["price"])
+            return 0
+        system.load_data()
+
+    items = system.search_items(args.text)[:args.limit]
+    if not items:
+        # Tidak ada yang cocok persis: tampilkan yang paling mirip (typo).
+        items = system.rank_items(args.text, args.limit)
+    for item in items:
+        print_item(item.sku, item.name, item.category, item.stock, item.price)
+    return 0 if items else 1
+
+def cmd_report(system, args):
+    if args.reorder:
+        return cmd_reorder(system, args)
+
+    report = dict(system.dashboard_stats(), items=len(system.items), categories=system.category_stats)
+    if args.json:
+        print(json.dumps(report, indent=4))
+        return 0
+
+    print(f"Items           : {report['items']:,}")
+    print(f"Total units     : {report['total_units']:,}")
+    print(f"Total value     : Rp{report['total_value']:,}")
+    print(f"Low stock       : {report['low_stock']}")
+    print(f"Out of stock    : {report['out_of_stock']}")
+    print(f"Today's in/out  : +{report['daily_in']} / -{report['daily_out']}")
+    for category, stats in sorted(report["categories"].items()):
+        print(f"  {category:<20} items={stats['items']:<6} units={stats['units']:<8} value=Rp{stats['value']:,}")
+    return 0
+
+def cmd_reorder(system, args):
+    report = system.reorder_report(args.limit)
+    if args.json:
+        print(json.dumps(report, indent=4))
+        return 0
+
+    print(f"{'sku':<12} {'name':<30} {'stock':>7} {'min':>7} {'order':>7}")
+    for row in report:
+        print(f"{row['sku']:<12} {row['name'][:30]:<30} {row['stock']:>7} {row['threshold']:>7} {row['reorder_qty']:>7}")
+    return 0
+
+def cmd_threshold(system, args):
+    if args.value != "default" and not args.value.isdigit():
+        print(f"Threshold tidak valid: {args.value}")
+        return 1
+    value = None if args.value == "default" else int(args.value)
+
+    if args.category:
+        ok = system.set_threshold(value, category=args.target)
+    else:
+        ok = system.set_threshold(value, sku=args.target)
+    if not ok:
+        print("Barang tidak ditemukan!")
+        return 1
+    return 0
+
+def cmd_analytics(system, args):
+    from inventory_analytics import InventoryAnalytics, format_report
+    analytics = InventoryAnalytics(system, args.days)
+    if args.export:
+        count = analytics.export_csv(args.export)
+        print(f"{count:,} item diekspor ke {args.export}")
+        return 0
+    report = analytics.report()
+    print(json.dumps(report, indent=4) if args.json else format_report(report))
+    return 0
+
+def cmd_history(system, args):
+    ledger = system.ledger
+    filters = {"start": args.start, "end": args.end, "sku": args.sku, "category": args.category}
+    if args.sku:
+        item = system.find_item(args.sku)
+        filters["sku"] = item.sku if item else args.sku
+
+    incoming = ledger.by_period("in", args.period, **filters)
+    outgoing = ledger.by_period("out", args.period, **filters)
+    periods = sorted(set(incoming) | set(outgoing))
+    print(f"{'period':<12} {'in':>10} {'out':>10} {'net':>10}")
+    for period in periods:
+        units_in, units_out = incoming.get(period, 0), outgoing.get(period, 0)
+        print(f"{period:<12} {units_in:>10} {units_out:>10} {units_in - units_out:>10}")
+    return 0 if periods else 1
+
+def cmd_import(system, args):
+    ok, errors = system.import_movements(args.file, args.kind)
+    if ok:
+        print("Batch berhasil diproses.")
+        return 0
+    print("Batch ditolak, tidak ada perubahan stok:")
+    for error in errors:
+        print(f"  {error}")
+    return 1
+
+def cmd_batch(system, args):
+    # Satu perintah per baris, mis. "stock-in MOU-001 5"; semua jalan di satu proses.
+    parser = build_parser(batch=True)
+    source = open(args.file, "r") if args.file and args.file != "-" else sys.stdin
+    failures = 0
+    system.start_persistence()
+    try:
+        for line in source:
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            try:
+                sub_args = parser.parse_args(shlex.split(line))
+            except SystemExit:
+                failures += 1
+                continue
+            if sub_args.func(system, sub_args) != 0:
+                failures += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 1 if failures else 0
+
+def cmd_scan(system, args):
+    # Feed scanner: satu SKU per baris (opsional jumlah), dari file, named pipe, atau stdin.
+    session = ScanSession(system, args.kind, args.window)
+    system.start_persistence()
+    reader = session.start_reader(sys.stdin if args.file == "-" else args.file)
+    try:
+        while reader.is_alive() or not session.idle():
+            time.sleep(SCAN_POLL_MS / 1000)
+            session.drain()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        session.stop()
+
+    print(format_totals(session.totals, args.kind))
+    for error in session.errors:
+        print(f"  {error}")
+    return 1 if session.totals["unknown"] or session.totals["rejected"] or session.totals["invalid"] else 0
+
+def build_parser(batch=False):
+    parser = argparse.ArgumentParser(prog="inventory_cli.py", description="Inventory Faaza Gadget Store tanpa GUI.")
+    if not batch:
+        parser.add_argument("--backend", choices=["binary", "json", "sqlite"], help="default: INVENTORY_BACKEND atau binary")
+        parser.add_argument("--data-dir", help="folder data (default: folder aplikasi)")
+        parser.add_argument("--server", help="host:port inventory_server.py (default: INVENTORY_SERVER, kalau diset)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, kind in (("stock-in", "in"), ("stock-out", "out")):
+        sub = commands.add_parser(name, help=f"stock {kind} satu barang")
+        sub.add_argument("item", help="SKU atau nama barang")
+        sub.add_argument("qty")
+        sub.set_defaults(func=lambda system, args, kind=kind: cmd_stock(system, args, kind))
+
+    sub = commands.add_parser("query", help="cari barang berdasarkan nama atau SKU")
+    sub.add_argument("text")
+    sub.add_argument("--limit", type=int, default=20)
+    sub.set_defaults(func=cmd_query)
+
+    sub = commands.add_parser("report", help="ringkasan stok")
+    sub.add_argument("--json", action="store_true")
+    sub.add_argument("--reorder", action="store_true", help="daftar barang di bawah threshold, paling mendesak dulu")
+    sub.add_argument("--limit", type=int)
+    sub.set_defaults(func=cmd_report)
+
+    sub = commands.add_parser("threshold", help="atur batas low stock per barang atau kategori")
+    sub.add_argument("target", help="SKU / nama barang, atau nama kategori dengan --category")
+    sub.add_argument("value", help="angka, atau 'default' untuk menghapus")
+    sub.add_argument("--category", action="store_true")
+    sub.set_defaults(func=cmd_threshold)
+
+    sub = commands.add_parser("analytics", help="nilai per kategori, ABC, sell-through, days of cover")
+    sub.add_argument("--days", type=int, default=30, help="window penjualan dari ledger")
+    sub.add_argument("--json", action="store_true")
+    sub.add_argument("--export", metavar="CSV", help="tulis metrik per item ke file CSV")
+    sub.set_defaults(func=cmd_analytics)
+
+    sub = commands.add_parser("history", help="riwayat stock in/out dari ledger")
+    sub.add_argument("--sku")
+    sub.add_argument("--category")
+    sub.add_argument("--period", choices=["day", "week", "month"], default="day")
+    sub.add_argument("--from", dest="start", help="YYYY-MM-DD")
+    sub.add_argument("--to", dest="end", help="YYYY-MM-DD")
+    sub.set_defaults(func=cmd_history)
+
+    sub = commands.add_parser("import", help="import batch CSV / JSON")
+    sub.add_argument("file")
+    sub.add_argument("--kind", choices=["in", "out"], required=True)
+    sub.set_defaults(func=cmd_import)
+
+    if not batch:
+        sub = commands.add_parser("batch", help="jalankan banyak perintah dari file atau stdin")
+        sub.add_argument("file", nargs="?", default="-")
+        sub.set_defaults(func=cmd_batch)
+
+        sub = commands.add_parser("scan", help="terima scan barcode dari file, named pipe, atau stdin")
+        sub.add_argument("file", nargs="?", default="-")
+        sub.add_argument("--kind", choices=["in", "out"], default="in")
+        sub.add_argument("--window", type=int, default=COALESCE_WINDOW_MS, help="ms; scan SKU sama dalam window ini digabung")
+        sub.set_defaults(func=cmd_scan)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    server = args.server or os.environ.get("INVENTORY_SERVER")
+    if server:
+        from inventory_remote import RemoteInventorySystem
+        try:
+            system = RemoteInventorySystem(server, verbose=False)
+        except OSError as e:
+            print(f"Tidak bisa terhubung ke server {server}: {e}")
+            return 1
+    else:
+        system = InventorySystem(args.backend, args.data_dir, verbose=False, lazy=True)
+        if args.func is not cmd_query:
+            system.load_data()
+    try:
+        return args.func(system, args)
+    finally:
+        # Snapshot penuh dibiarkan ke compaction berikutnya supaya tiap perintah tetap murah.
+        system.close(compact=False)
+
+if __name__ == "__main__":
+    sys.exit(main())
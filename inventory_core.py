@@ -0,0 +1,1205 @@
+import json
+import heapq
+from collections import OrderedDict
+import os
+import sys
+import threading
+import time
+import queue
+import re
+import shutil
+from collections import deque
+from datetime import date
+
+from inventory_ledger import Ledger
+from inventory_perf import perf
+from inventory_reorder import ReorderEngine
+from inventory_search import NGRAM_SIZE, SearchService, make_ngrams, normalize_text
+from inventory_snapshot import BinarySnapshot, SnapshotError, write_snapshot
+
+JOURNAL_COMPACT_EVERY = 500
+JOURNAL_COMPACT_INTERVAL = 60
+PERSIST_INTERVAL = 0.5
+LOW_STOCK_THRESHOLD = 10
+RECENT_ACTIVITY_SIZE = 10
+SEARCH_CACHE_SIZE = 64
+MATCH_SUGGESTIONS = 5
+IMPORT_CHUNK_SIZE = 65536
+LOAD_PAGE_SIZE = 500
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+JSON_DELIMITERS = frozenset(" \t\n\r,:]}")
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    sku TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    category TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    stock INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_name_key ON items (name_key);
+CREATE INDEX IF NOT EXISTS idx_items_category ON items (category);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+SQL_INSERT_ITEM = "INSERT INTO items (sku, name, name_key, category, price, stock) VALUES (?, ?, ?, ?, ?, ?)"
+SQL_UPDATE_STOCK = "UPDATE items SET stock = stock + ? WHERE sku = ?"
+SQL_DELETE_ITEM = "DELETE FROM items WHERE sku = ?"
+SQL_UPSERT_META = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+
+class JsonStream:
+    def __init__(self, f, chunk_size=IMPORT_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            self.pos = JSON_WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Format JSON tidak valid, '{char}' diharapkan")
+        self.pos += 1
+
+    def read_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self.eof:
+                    raise
+                self.fill()
+                continue
+            # Angka yang terpotong batas chunk ("1." | "5") ikut terdecode sebagai angka yang lebih
+            # pendek, jadi angka baru dianggap utuh kalau diikuti pemisah JSON atau EOF.
+            if self.eof or (end < len(self.buf) and (self.buf[end] in JSON_DELIMITERS or not is_number(value))):
+                self.pos = end
+                return value
+            self.fill()
+
+    def iter_object(self):
+        # Yield tiap key; pemanggil wajib membaca value-nya sebelum lanjut ke key berikutnya.
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError("Format JSON tidak valid, ',' atau '}' diharapkan")
+
+    def iter_array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+
+        decode = self.decoder.raw_decode
+        skip = JSON_WHITESPACE.match
+        while True:
+            # Jalur cepat: elemen dan pemisah sesudahnya sudah utuh di buffer.
+            try:
+                value, end = decode(self.buf, self.pos)
+                sep = skip(self.buf, end).end()
+            except ValueError:
+                sep = len(self.buf)
+            if sep < len(self.buf) and self.buf[sep] in ",]":
+                self.pos = sep + 1
+                char = self.buf[sep]
+            else:
+                value = self.read_value()
+                char = self.peek()
+                self.pos += 1
+            yield value
+
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError("Format JSON tidak valid, ',' atau ']' diharapkan")
+            self.pos = skip(self.buf, self.pos).end()
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def iter_movements(path):
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", newline="") as f:
+        if ext == ".csv":
+            import csv
+
+            for row in csv.reader(f):
+                if not row or not row[0].strip():
+                    continue
+                if row[0].strip().lower() == "sku":
+                    continue
+                yield row[0].strip(), row[1].strip() if len(row) > 1 else ""
+            return
+
+        if ext == ".jsonl":
+            entries = (json.loads(line) for line in f if line.strip())
+        else:
+            entries = JsonStream(f).iter_array()
+
+        for entry in entries:
+            if isinstance(entry, dict):
+                yield entry.get("sku"), entry.get("qty", entry.get("quantity"))
+            else:
+                yield entry[0], entry[1]
+
+def file_signature(*paths):
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+def journal_continues(base_seq, first_seq):
+    # Journal hanya bisa diterapkan di atas snapshot kalau record pertamanya tidak melompati seq.
+    return base_seq + 1 >= first_seq
+
+def warn(message):
+    # stderr, supaya output CLI (mis. report --json) tetap bisa diparse.
+    print(message, file=sys.stderr)
+
+class Item:
+    # Tanpa __dict__ per objek; kategori di-intern supaya satu string dipakai bersama.
+    __slots__ = ("name", "category", "price", "stock", "sku", "version")
+
+    def __init__(self, name, category, price, stock, sku, version=0):
+        self.name = name
+        self.category = sys.intern(category)
+        self.price = price
+        self.stock = stock
+        self.sku = sku
+        self.version = version
+
+    @staticmethod
+    def sku_prefix(category):
+        return category[:3].upper() if len(category) >= 3 else category.upper()
+
+class JsonStorage:
+    def __init__(self, data_file, journal_file):
+        self.data_file = data_file
+        self.journal_file = journal_file
+        self.pending = 0
+
+    def exists(self):
+        return os.path.exists(self.data_file) or os.path.exists(self.journal_file)
+
+    def signature(self):
+        return file_signature(self.data_file, self.journal_file)
+
+    def iter_load(self, page_size=LOAD_PAGE_SIZE):
+        if not os.path.exists(self.data_file):
+            return
+
+        meta = {}
+        with open(self.data_file, "r") as f:
+            stream = JsonStream(f)
+            for key in stream.iter_object():
+                if key != "items":
+                    meta[key] = stream.read_value()
+                    continue
+                page = []
+                for item_data in stream.iter_array():
+                    page.append(item_data)
+                    if len(page) >= page_size:
+                        yield "items", page
+                        page = []
+                if page:
+                    yield "items", page
+        yield "meta", meta
+
+    def stored_seq(self):
+        # journal_seq yang tercatat di inventory_data.json; 0 kalau file belum ada.
+        if not os.path.exists(self.data_file):
+            return 0
+        with open(self.data_file, "r") as f:
+            stream = JsonStream(f)
+            for key in stream.iter_object():
+                if key == "journal_seq":
+                    return stream.read_value()
+                if key == "items":
+                    for _ in stream.iter_array():
+                        pass
+                else:
+                    stream.read_value()
+        return 0
+
+    def first_journal_seq(self):
+        try:
+            with open(self.journal_file, "r") as f:
+                return json.loads(f.readline())["seq"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def iter_journal(self):
+        self.pending = 0
+        if not os.path.exists(self.journal_file):
+            return
+
+        complete = 0
+        torn = False
+        with open(self.journal_file, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Record yang rusak di tengah journal tidak bisa dilewati begitu saja.
+                    if f.read(1):
+                        raise ValueError(f"Journal rusak setelah byte {complete}")
+                    torn = True
+                    break
+                complete += len(line)
+                self.pending += 1
+                yield record
+
+        # Baris terakhir bisa terpotong kalau aplikasi crash saat menulis. Dipotong balik ke
+        # record utuh terakhir, supaya append berikutnya tidak menempel ke baris rusak itu.
+        if torn:
+            warn("System: Journal terpotong, record terakhir yang tidak utuh dibuang.")
+            os.truncate(self.journal_file, complete)
+        elif complete and not line.endswith(b"\n"):
+            with open(self.journal_file, "ab") as f:
+                f.write(b"\n")
+
+    def append(self, records, meta):
+        payload = "".join(json.dumps(record) + "\n" for record in records)
+        with open(self.journal_file, "a") as f:
+            f.write(payload)
+        self.pending += len(records)
+        perf.add_bytes(len(payload))
+
+    def save(self, data):
+        tmp_file = self.data_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        perf.add_bytes(os.path.getsize(tmp_file))
+        os.replace(tmp_file, self.data_file)
+
+        open(self.journal_file, "w").close()
+        self.pending = 0
+
+    def needs_compaction(self, force=False):
+        return self.pending > 0 and (force or self.pending >= JOURNAL_COMPACT_EVERY)
+
+class BinaryStorage(JsonStorage):
+    # Snapshot biner (inventory_snapshot) + journal JSON yang sama dengan JsonStorage.
+    # inventory_data.json hanya dibaca kalau snapshot biner belum ada atau rusak.
+    def __init__(self, bin_file, data_file, journal_file):
+        super().__init__(data_file, journal_file)
+        self.bin_file = bin_file
+        self.rewrite = False
+
+    def exists(self):
+        return os.path.exists(self.bin_file)
+
+    def signature(self):
+        return file_signature(self.bin_file, self.journal_file)
+
+    def open_snapshot(self):
+        try:
+            return BinarySnapshot(self.bin_file)
+        except (OSError, SnapshotError) as e:
+            if os.path.exists(self.bin_file):
+                warn(f"System: Snapshot biner tidak bisa dibaca ({e}).")
+            return None
+
+    def iter_load(self, page_size=LOAD_PAGE_SIZE):
+        if os.path.exists(self.bin_file):
+            snapshot = self.open_snapshot()
+            snapshot_seq = None
+            if snapshot is not None:
+                try:
+                    # Semua checksum dicek sebelum halaman pertama dipakai.
+                    snapshot.verify()
+                    meta = snapshot.meta()
+                    for page in snapshot.iter_pages(page_size):
+                        yield "items", page
+                    yield "meta", meta
+                    return
+                except SnapshotError as e:
+                    warn(f"System: Snapshot biner rusak ({e}).")
+                    snapshot_seq = self.readable_seq(snapshot)
+                finally:
+                    snapshot.close()
+            self.check_fallback(snapshot_seq)
+
+        if os.path.exists(self.data_file):
+            warn("System: Memakai inventory_data.json, snapshot biner ditulis ulang setelah load.")
+            yield from super().iter_load(page_size)
+            # Baru ditandai setelah JSON terbaca utuh; load yang gagal tidak boleh jadi snapshot.
+            self.rewrite = True
+
+    def readable_seq(self, snapshot):
+        try:
+            return snapshot.meta().get("journal_seq", 0)
+        except (SnapshotError, ValueError):
+            return None
+
+    def check_fallback(self, snapshot_seq):
+        # JSON hanya boleh menggantikan snapshot rusak kalau JSON + journal masih lengkap:
+        # JSON minimal sebaru snapshot, atau journal masih menyambung dari seq JSON.
+        json_seq = self.stored_seq()
+        first_seq = self.first_journal_seq()
+        corrupt_copy = self.bin_file + ".corrupt"
+        shutil.copyfile(self.bin_file, corrupt_copy)
+        if (snapshot_seq is not None and json_seq >= snapshot_seq) or (first_seq is not None and journal_continues(json_seq, first_seq)):
+            warn(f"System: Salinan snapshot rusak disimpan di {corrupt_copy}.")
+            return
+        raise SnapshotError(
+            f"Snapshot biner rusak dan inventory_data.json (seq {json_seq}) lebih lama dari journal; "
+            f"data tidak dimuat supaya tidak ada perubahan yang hilang. Salinan snapshot: {corrupt_copy}"
+        )
+
+    def lookup(self, sku):
+        # Cari satu item tanpa load penuh: binary search di snapshot lalu terapkan journal untuk SKU itu.
+        snapshot = self.open_snapshot()
+        if snapshot is None:
+            return None
+        try:
+            item = snapshot.find(sku)
+            seq = snapshot.meta().get("journal_seq", 0)
+        except SnapshotError:
+            return None
+        finally:
+            snapshot.close()
+
+        key = sku.strip().lower()
+        for record in self.iter_journal():
+            if record["seq"] <= seq:
+                continue
+            op = record["op"]
+            if op == "add" and record["sku"].lower() == key:
+                item = {name: record[name] for name in ("name", "sku", "category", "price", "stock")}
+            elif item is None:
+                continue
+            elif op == "del" and record["sku"].lower() == key:
+                item = None
+            elif op in ("in", "out") and record["sku"].lower() == key:
+                item["stock"] += record["amount"] if op == "in" else -record["amount"]
+            elif op == "batch":
+                for move_sku, amount in record["moves"]:
+                    if move_sku.lower() == key:
+                        item["stock"] += amount if record["kind"] == "in" else -amount
+        return item
+
+    def save(self, data):
+        tmp_file = self.bin_file + ".tmp"
+        perf.add_bytes(write_snapshot(tmp_file, data))
+        os.replace(tmp_file, self.bin_file)
+
+        open(self.journal_file, "w").close()
+        self.pending = 0
+        self.rewrite = False
+
+    def needs_compaction(self, force=False):
+        return self.rewrite or super().needs_compaction(force)
+
+class SqliteStorage:
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.conn = None
+
+    def connect(self):
+        if self.conn is None:
+            # Setelah start, koneksi hanya dipakai oleh thread persistence.
+            import sqlite3
+            self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SQLITE_SCHEMA)
+        return self.conn
+
+    def exists(self):
+        return os.path.exists(self.db_file)
+
+    def signature(self):
+        return file_signature(self.db_file, self.db_file + "-wal")
+
+    def iter_load(self, page_size=LOAD_PAGE_SIZE):
+        conn = self.connect()
+        meta = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM meta")}
+        if not meta:
+            return
+
+        cursor = conn.execute("SELECT name, sku, category, price, stock FROM items ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(page_size)
+            if not rows:
+                break
+            yield "items", [
+                {"name": name, "sku": sku, "category": category, "price": price, "stock": stock}
+                for name, sku, category, price, stock in rows
+            ]
+        yield "meta", meta
+
+    def iter_journal(self):
+        return iter(())
+
+    def append(self, records, meta):
+        conn = self.connect()
+        # Satu transaksi per flush; stock dan meta ikut commit bersama.
+        with conn:
+            for record in records:
+                op = record["op"]
+                if op == "add":
+                    conn.execute(SQL_INSERT_ITEM, (record["sku"], record["name"], normalize_text(record["name"]), record["category"], record["price"], record["stock"]))
+                elif op in ("in", "out"):
+                    sign = 1 if op == "in" else -1
+                    conn.execute(SQL_UPDATE_STOCK, (sign * record["amount"], record["sku"]))
+                elif op == "batch":
+                    sign = 1 if record["kind"] == "in" else -1
+                    conn.executemany(SQL_UPDATE_STOCK, [(sign * amount, sku) for sku, amount in record["moves"]])
+                elif op == "del":
+                    conn.execute(SQL_DELETE_ITEM, (record["sku"],))
+            conn.executemany(SQL_UPSERT_META, [(key, json.dumps(value)) for key, value in meta.items()])
+
+    def save(self, data):
+        conn = self.connect()
+        with conn:
+            conn.execute("DELETE FROM items")
+            conn.executemany(SQL_INSERT_ITEM, [
+                (item["sku"], item["name"], normalize_text(item["name"]), item["category"], item["price"], item["stock"])
+                for item in data["items"]
+            ])
+            conn.executemany(SQL_UPSERT_META, [(key, json.dumps(value)) for key, value in data.items() if key != "items"])
+
+    def needs_compaction(self, force=False):
+        return False
+
+class InventorySystem:
+    def __init__(self, backend=None, data_dir=None, verbose=True, lazy=False):
+        self.items = []
+        self.verbose = verbose
+
+        self.sku_index = {}
+        self.name_index = {}
+        self.ngram_index = None
+        self.item_order = {}
+        self.order_counter = 0
+        self.index_version = 0
+        self.search_cache = OrderedDict()
+        self.category_counter = {}
+
+        self.stats = {}
+        self.category_stats = {}
+        self.listeners = []
+        self.reorder = ReorderEngine(LOW_STOCK_THRESHOLD)
+        self.reset_stats()
+        self.search = SearchService(self)
+
+        self.recent_activity = deque(maxlen=RECENT_ACTIVITY_SIZE)
+        self.current_date = date.today()
+        self.journal_seq = 0
+
+        self.lock = threading.RLock()
+        self.pending_records = []
+        self.autoflush = True
+        self.persist_errors = queue.Queue()
+        self.persist_thread = None
+        self.persist_stop = threading.Event()
+        self.last_compaction = 0
+        self.persist_failing = False
+        self.last_error = None
+        self.loaded = threading.Event()
+        self.load_failed = False
+        self.loaded_signature = None
+        self.open_storage(backend, data_dir, lazy)
+
+    def open_storage(self, backend, data_dir, lazy):
+        if data_dir:
+            application_path = data_dir
+        elif getattr(sys, 'frozen', False):
+            application_path = os.path.dirname(sys.executable)
+        elif __file__:
+            application_path = os.path.dirname(__file__)
+
+        self.data_file = os.path.join(application_path, "inventory_data.json")
+        self.journal_file = os.path.join(application_path, "inventory_journal.log")
+        self.db_file = os.path.join(application_path, "inventory_data.db")
+        self.bin_file = os.path.join(application_path, "inventory_data.bin")
+        self.ledger = Ledger(os.path.join(application_path, "ledger"))
+        self.ledger.load()
+
+        self.backend = backend or os.environ.get("INVENTORY_BACKEND", "binary")
+        if self.backend == "sqlite":
+            self.storage = SqliteStorage(self.db_file)
+            self.log(f"File database lokasi di: {self.db_file}")
+        elif self.backend == "binary":
+            self.storage = BinaryStorage(self.bin_file, self.data_file, self.journal_file)
+            self.log(f"File database lokasi di: {self.bin_file}")
+        else:
+            self.storage = JsonStorage(self.data_file, self.journal_file)
+            self.log(f"File database lokasi di: {self.data_file}")
+
+        # Data terbaru ada di snapshot biner + journal kalau .bin pernah ditulis; JSON bisa tertinggal.
+        if self.backend == "sqlite" and not self.storage.exists() and (os.path.exists(self.bin_file) or os.path.exists(self.data_file)):
+            self.migrate_storage()
+        elif self.backend == "json" and os.path.exists(self.bin_file):
+            self.migrate_storage()
+        elif not lazy:
+            self.load_data()
+
+    def migrate_storage(self):
+        # BinaryStorage sendiri jatuh ke JSON + journal kalau .bin belum ada.
+        target = self.storage
+        self.storage = BinaryStorage(self.bin_file, self.data_file, self.journal_file)
+        self.load_data()
+        self.storage = target
+        if self.load_failed or not self.save_data():
+            return
+        if self.backend == "json":
+            # JsonStorage.save sudah mengosongkan journal; .bin lama tidak boleh dibaca lagi.
+            os.replace(self.bin_file, self.bin_file + ".migrated")
+        self.log(f"System: {len(self.items)} item dimigrasi ke {self.backend}.")
+
+    @perf.timed("load_data")
+    def load_data(self, force=False):
+        # File yang tidak berubah sejak load/tulis terakhir tidak perlu diparse ulang.
+        if not force and self.loaded_signature is not None and self.storage.signature() == self.loaded_signature:
+            return False
+
+        for _ in self.hydrate():
+            pass
+        return True
+
+    def start_background_load(self):
+        if self.loaded.is_set():
+            return
+        pages = self.hydrate()
+        next(pages, None)
+
+        # Halaman pertama sudah siap; sisanya dimuat di background supaya window cepat tampil.
+        thread = threading.Thread(target=lambda: [None for _ in pages], name="inventory-load", daemon=True)
+        thread.start()
+
+    def hydrate(self):
+        signature = self.storage.signature()
+        with self.lock:
+            self.loaded.clear()
+            self.items = []
+            self.clear_index()
+            self.reset_stats()
+            self.category_counter = {}
+            self.recent_activity = deque(maxlen=RECENT_ACTIVITY_SIZE)
+            self.journal_seq = 0
+            self.load_failed = False
+            self.reorder.begin_bulk()
+
+        try:
+            for kind, payload in self.storage.iter_load():
+                with self.lock:
+                    if kind == "items":
+                        self.restore_items(payload)
+                    else:
+                        self.restore_meta(payload)
+                yield
+        except Exception as e:
+            warn(f"Gagal load data: {e}")
+            self.load_failed = True
+            self.persist_errors.put(f"Gagal load data: {e}")
+
+        with self.lock:
+            self.reorder.end_bulk()
+            # Journal tidak diterapkan di atas catalog yang tidak lengkap.
+            if not self.load_failed:
+                self.replay_journal()
+            self.search_cache.clear()
+        self.loaded_signature = signature
+        self.loaded.set()
+
+    def restore_items(self, items_data):
+        for item_data in items_data:
+            new_item = Item(item_data['name'], item_data['category'], item_data['price'], item_data['stock'], item_data['sku'], item_data.get('version', 0))
+            self.items.append(new_item)
+            self.index_item(new_item)
+            self.track_item(new_item, 1)
+
+    def restore_meta(self, data):
+        self.recent_activity = deque(data.get("recent_activity", []), maxlen=RECENT_ACTIVITY_SIZE)
+        self.journal_seq = data.get("journal_seq", 0)
+        thresholds = data.get("thresholds") or {}
+        if thresholds.get("items") or thresholds.get("categories"):
+            # Threshold ada di meta yang dibaca setelah semua item, jadi daftar low stock dihitung ulang sekali.
+            self.reorder.restore(thresholds)
+            self.reorder.rebuild(self.items)
+
+    def replay_journal(self):
+        first = True
+        try:
+            for record in self.storage.iter_journal():
+                if first and not journal_continues(self.journal_seq, record["seq"]):
+                    raise ValueError(
+                        f"journal dimulai dari seq {record['seq']}, data hanya sampai seq {self.journal_seq}; "
+                        "snapshot yang lebih baru mungkin ada di backend lain"
+                    )
+                first = False
+                # Record yang sudah masuk snapshot dilewati (crash di antara rename dan truncate).
+                if record["seq"] <= self.journal_seq:
+                    continue
+                self.apply_record(record)
+                self.journal_seq = record["seq"]
+        except Exception as e:
+            warn(f"Gagal replay journal: {e}")
+            self.load_failed = True
+            self.persist_errors.put(f"Gagal replay journal: {e}")
+
+    def snapshot_meta(self):
+        return {
+            "date": str(date.today()),
+            "recent_activity": list(self.recent_activity),
+            "thresholds": self.reorder.export(),
+            "journal_seq": self.journal_seq
+        }
+
+    def build_snapshot(self):
+        with self.lock:
+            data = self.snapshot_meta()
+            data["items"] = [
+                {"name": item.name, "sku": item.sku, "category": item.category, "price": item.price, "stock": item.stock}
+                for item in self.items
+            ]
+            return data
+
+    @perf.timed("save_data")
+    def save_data(self):
+        try:
+            self.storage.save(self.build_snapshot())
+            self.loaded_signature = self.storage.signature()
+            self.log("Data berhasil disimpan.")
+            return True
+        except Exception as e:
+            self.report_error(f"Gagal menyimpan data: {e}")
+            return False
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def report_error(self, message):
+        # Dipanggil dari thread mana saja; UI mengambil pesan ini lewat poll_errors.
+        warn(f"Error Saving Data: {message}")
+        self.persist_errors.put(message)
+
+    def poll_errors(self):
+        errors = []
+        while not self.persist_errors.empty():
+            errors.append(self.persist_errors.get_nowait())
+        return errors
+
+    def start_persistence(self):
+        if self.persist_thread is None:
+            self.persist_stop.clear()
+            self.last_compaction = time.monotonic()
+            self.persist_thread = threading.Thread(target=self.persistence_loop, name="inventory-persistence", daemon=True)
+            self.persist_thread.start()
+
+    def persistence_loop(self):
+        while not self.persist_stop.wait(PERSIST_INTERVAL):
+            self.flush()
+            if time.monotonic() - self.last_compaction >= JOURNAL_COMPACT_INTERVAL:
+                self.compact_journal(force=True)
+                self.last_compaction = time.monotonic()
+
+    def close(self, compact=True):
+        if self.persist_thread is not None:
+            self.persist_stop.set()
+            self.persist_thread.join()
+            self.persist_thread = None
+        self.flush()
+        # Tanpa compact tetap cek needs_compaction: migrasi JSON -> biner (rewrite) ditulis sekarang.
+        self.compact_journal(force=compact)
+
+    @perf.timed("flush")
+    def flush(self):
+        with self.lock:
+            records = self.pending_records
+            self.pending_records = []
+            meta = self.snapshot_meta()
+        if not records:
+            return True
+
+        try:
+            self.ledger.flush()
+            self.storage.append(records, meta)
+        except Exception as e:
+            with self.lock:
+                self.pending_records = records + self.pending_records
+            # Dicoba lagi tiap interval, tapi UI cukup diberi tahu sekali.
+            if not self.persist_failing:
+                self.report_error(f"Gagal menulis journal: {e}")
+            self.persist_failing = True
+            return False
+
+        self.persist_failing = False
+        self.loaded_signature = self.storage.signature()
+        self.compact_journal()
+        return True
+
+    def compact_journal(self, force=False):
+        # Selama load di background catalog di memory belum lengkap; snapshot-nya akan menimpa data asli.
+        # Begitu juga kalau load / replay gagal: file lama dan journal dibiarkan untuk dipulihkan.
+        if not self.loaded.is_set() or self.load_failed:
+            return
+        if self.storage.needs_compaction(force):
+            self.save_data()
+
+    def commit(self, record):
+        self.loaded.wait()
+        self.last_error = None
+        if self.load_failed:
+            # Catalog di memory tidak lengkap; record baru akan menimpa journal / snapshot yang
+            # masih harus dipulihkan.
+            self.last_error = "Data gagal dimuat, perubahan ditolak. Pulihkan file data lalu buka ulang aplikasi."
+            self.report_error(self.last_error)
+            return False
+        before = self.dashboard_stats()
+        with self.lock:
+            self.journal_seq += 1
+            record["seq"] = self.journal_seq
+            record["date"] = str(date.today())
+            self.apply_record(record)
+            self.record_ledger(record)
+            self.pending_records.append(record)
+
+        # Tanpa thread persistence (mis. script), tulis langsung.
+        if self.persist_thread is None and self.autoflush:
+            self.flush()
+
+        self.emit("item", record)
+        self.emit_stats_changes(before)
+        return True
+
+    def apply_record(self, record):
+        op = record["op"]
+
+        if op == "add":
+            item = Item(record["name"], record["category"], record["price"], record["stock"], record["sku"])
+            self.items.append(item)
+            self.index_item(item)
+            self.track_item(item, 1)
+            self.log_activity(f"New Item: {item.name}", "add")
+        elif op == "in":
+            item = self.get_item(record["sku"])
+            self.move_stock(item, record["amount"], "in")
+            self.log_activity(f"Stock In: {record['amount']}x {item.name}", "in")
+        elif op == "out":
+            item = self.get_item(record["sku"])
+            self.move_stock(item, record["amount"], "out")
+            self.log_activity(f"Stock Out: {record['amount']}x {item.name}", "out")
+        elif op == "batch":
+            units = 0
+            for sku, amount in record["moves"]:
+                self.move_stock(self.get_item(sku), amount, record["kind"])
+                units += amount
+            label = "Stock In" if record["kind"] == "in" else "Stock Out"
+            self.log_activity(f"Batch {label}: {units}x ({len(record['moves'])} items)", record["kind"])
+        elif op == "del":
+            item = self.get_item(record["sku"])
+            self.items.remove(item)
+            self.unindex_item(item)
+            self.track_item(item, -1)
+            self.reorder.item_thresholds.pop(item.sku.lower(), None)
+            self.log_activity(f"Deleted: {item.name}", "del")
+        elif op == "threshold":
+            self.apply_threshold(record)
+
+    def apply_threshold(self, record):
+        if "sku" in record:
+            item = self.get_item(record["sku"])
+            thresholds, key, items, label = self.reorder.item_thresholds, item.sku.lower(), [item], item.name
+        else:
+            thresholds, key, label = self.reorder.category_thresholds, record["category"], record["category"]
+            items = [item for item in self.items if item.category == key]
+
+        if record["value"] is None:
+            thresholds.pop(key, None)
+        else:
+            thresholds[key] = record["value"]
+        for item in items:
+            self.reorder.track(item, -1)
+            self.reorder.track(item, 1)
+        value = record["value"] if record["value"] is not None else "default"
+        self.log_activity(f"Threshold {label}: {value}", "threshold")
+
+    def move_stock(self, item, amount, kind):
+        self.track_item(item, -1)
+        item.stock += amount if kind == "in" else -amount
+        item.version += 1
+        self.track_item(item, 1)
+
+    def record_ledger(self, record):
+        op = record["op"]
+        if op in ("in", "out"):
+            moves, kind = [(record["sku"], record["amount"])], op
+        elif op == "batch":
+            moves, kind = record["moves"], record["kind"]
+        else:
+            return
+        for sku, amount in moves:
+            self.ledger.record(kind, sku, self.get_item(sku).category, amount)
+
+    @property
+    def daily_in(self):
+        return self.ledger.day_total("in")
+
+    @property
+    def daily_out(self):
+        return self.ledger.day_total("out")
+
+    def reset_stats(self):
+        self.stats = {"total_units": 0, "total_value": 0, "out_of_stock": 0}
+        self.category_stats = {}
+        self.reorder.clear()
+
+    def track_item(self, item, sign):
+        self.stats["total_units"] += sign * item.stock
+        self.stats["total_value"] += sign * item.stock * item.price
+        if item.stock <= 0: self.stats["out_of_stock"] += sign
+        self.reorder.track(item, sign)
+
+        cat = self.category_stats.setdefault(item.category, {"items": 0, "units": 0, "value": 0})
+        cat["items"] += sign
+        cat["units"] += sign * item.stock
+        cat["value"] += sign * item.stock * item.price
+        if cat["items"] == 0:
+            del self.category_stats[item.category]
+
+    def dashboard_stats(self):
+        return dict(self.stats, low_stock=len(self.reorder), daily_in=self.daily_in, daily_out=self.daily_out)
+
+    def stock_status(self, item):
+        return self.reorder.status(item)
+
+    def low_stock_items(self, limit=None):
+        # Sudah terurut dari yang paling mendesak; cukup ambil k pertama.
+        return [self.sku_index[key] for key in self.reorder.low_skus(limit)]
+
+    def reorder_report(self, limit=None):
+        return [
+            {"sku": item.sku, "name": item.name, "category": item.category, "stock": item.stock,
+             "threshold": self.reorder.threshold_for(item), "reorder_qty": self.reorder.reorder_qty(item)}
+            for item in self.low_stock_items(limit)
+        ]
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def emit(self, event, payload):
+        for callback in self.listeners:
+            callback(event, payload)
+
+    def emit_stats_changes(self, before):
+        after = self.dashboard_stats()
+        changed = {key: value for key, value in after.items() if before.get(key) != value}
+        if changed:
+            self.emit("stats", changed)
+
+    def clear_index(self):
+        self.search_cache.clear()
+        self.sku_index = {}
+        self.name_index = {}
+        self.ngram_index = None
+        self.item_order = {}
+        self.order_counter = 0
+
+    def index_item(self, item):
+        key = item.sku.lower()
+        self.sku_index[key] = item
+        self.name_index.setdefault(normalize_text(item.name), []).append(item)
+        self.item_order[key] = self.order_counter
+        self.order_counter += 1
+        self.index_version += 1
+        self.search_cache.clear()
+        if self.ngram_index is not None:
+            self.index_ngrams(item, self.ngram_index)
+
+    def index_ngrams(self, item, index):
+        key = item.sku.lower()
+        for gram in make_ngrams(normalize_text(item.name)) | make_ngrams(key):
+            index.setdefault(gram, set()).add(key)
+
+    def build_ngram_index(self):
+        # N-gram index cukup besar, jadi baru dibangun saat pencarian substring pertama.
+        # Diisi di dict baru dulu supaya pencarian di thread lain tidak melihat index setengah jadi,
+        # dan di bawah lock supaya item yang ditambah loader di tengah build tidak terlewat.
+        with self.lock:
+            index = {}
+            for item in self.items:
+                self.index_ngrams(item, index)
+            self.ngram_index = index
+
+    def unindex_item(self, item):
+        key = item.sku.lower()
+        del self.sku_index[key]
+        del self.item_order[key]
+        self.index_version += 1
+        self.search_cache.clear()
+        name = normalize_text(item.name)
+        same_name = self.name_index[name]
+        same_name.remove(item)
+        if not same_name:
+            del self.name_index[name]
+        if self.ngram_index is not None:
+            self.unindex_ngrams(item, self.ngram_index)
+
+    def unindex_ngrams(self, item, index):
+        key = item.sku.lower()
+        for gram in make_ngrams(normalize_text(item.name)) | make_ngrams(key):
+            postings = index.get(gram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del index[gram]
+
+    def get_item(self, sku):
+        return self.sku_index.get(sku.strip().lower())
+    
+    def poll_changes(self):
+        # Hanya relevan untuk replica (lihat inventory_remote); sistem lokal tidak punya perubahan dari luar.
+        return 0
+
+    def check_daily_reset(self):
+        now = date.today()
+        if now != self.current_date:
+            # Angka harian dibaca dari ledger per tanggal, jadi cukup beri tahu UI.
+            self.current_date = now
+            self.emit("stats", {"daily_in": self.daily_in, "daily_out": self.daily_out})
+            return True
+        return False
+
+    @perf.timed("add_item")
+    def add_item(self, name, category, price, stock):
+        sku = self.next_sku(category)
+        return self.commit({"op": "add", "name": name, "category": category, "price": price, "stock": stock, "sku": sku})
+
+    def next_sku(self, category):
+        prefix = Item.sku_prefix(category)
+        num = self.category_counter.get(category, 1)
+        # Counter kategori tidak ikut disimpan, jadi lewati SKU yang sudah terpakai.
+        while f"{prefix}-{num:03d}".lower() in self.sku_index:
+            num += 1
+        self.category_counter[category] = num + 1
+        return f"{prefix}-{num:03d}"
+
+    @perf.timed("search_item")
+    def search_item(self, name_or_sku):
+        # Seperti find_item, tapi alasan gagalnya (tidak ada / ambigu) dicatat di last_error.
+        self.last_error = None
+        item, matches = self.match_item(name_or_sku)
+        if item is None and matches:
+            choices = "; ".join(f"{match.sku} {match.name}" for match in matches)
+            self.last_error = f"'{name_or_sku}' cocok dengan beberapa barang, pilih salah satu: {choices}"
+        elif item is None:
+            self.last_error = f"Barang '{name_or_sku}' tidak ditemukan."
+        return item
+
+    def find_item(self, name_or_sku):
+        return self.match_item(name_or_sku)[0]
+
+    def match_item(self, name_or_sku):
+        # Transaksi hanya menerima SKU / nama persis atau satu barang dengan skor tertinggi.
+        # Kalau beberapa barang sama kuat hasilnya (None, kandidat) supaya pemanggil bisa menawarkan pilihan.
+        text = normalize_text(name_or_sku)
+        if not text:
+            return None, []
+
+        item = self.sku_index.get(text)
+        if item:
+            return item, [item]
+
+        same_name = self.name_index.get(text)
+        if same_name:
+            return (same_name[0] if len(same_name) == 1 else None), same_name[:MATCH_SUGGESTIONS]
+
+        # Tanpa typo-tolerance: prefix SKU / nama menang atas substring biasa.
+        matches = self.search.rank_scored(text, limit=MATCH_SUGGESTIONS, fuzzy=False)
+        if len(matches) == 1 or (len(matches) > 1 and matches[0][0] > matches[1][0]):
+            return matches[0][1], [matches[0][1]]
+        return None, [item for _, item in matches]
+
+    def rank_items(self, query, limit=10):
+        return self.search.rank(query, limit)
+
+    @perf.timed("search_items")
+    def search_items(self, query, limit=None):
+        text = normalize_text(query)
+        if not text:
+            return list(self.items)
+        if limit:
+            return self.lookup_items(text, limit)
+
+        if text in self.search_cache:
+            self.search_cache.move_to_end(text)
+            return self.search_cache[text]
+
+        # Hasil query yang lebih panjang pasti subset dari hasil prefix-nya.
+        results = None
+        for end in range(len(text) - 1, 0, -1):
+            previous = self.search_cache.get(text[:end])
+            if previous is not None:
+                results = [item for item in previous if text in item.sku.lower() or text in normalize_text(item.name)]
+                break
+        if results is None:
+            results = self.lookup_items(text)
+
+        self.search_cache[text] = results
+        if len(self.search_cache) > SEARCH_CACHE_SIZE:
+            self.search_cache.popitem(last=False)
+        return results
+
+    def lookup_items(self, text, limit=None):
+        if len(text) < NGRAM_SIZE:
+            return self.scan_items(text, limit)
+
+        if self.ngram_index is None:
+            self.build_ngram_index()
+
+        postings = []
+        for gram in make_ngrams(text):
+            if gram not in self.ngram_index:
+                return []
+            postings.append(self.ngram_index[gram])
+        postings.sort(key=len)
+
+        # Query yang sangat umum lebih cepat discan berurutan karena berhenti di hasil pertama.
+        if limit and len(postings[0]) * 8 > len(self.items):
+            return self.scan_items(text, limit)
+
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            candidates &= other
+            if not candidates:
+                return []
+
+        verified = [key for key in candidates if text in key or text in normalize_text(self.sku_index[key].name)]
+        if limit:
+            verified = heapq.nsmallest(limit, verified, key=self.item_order.get)
+        else:
+            verified.sort(key=self.item_order.get)
+        return [self.sku_index[key] for key in verified]
+
+    def scan_items(self, text, limit=None):
+        results = []
+        for item in self.items:
+            if text in item.sku.lower() or text in normalize_text(item.name):
+                results.append(item)
+                if limit and len(results) >= limit:
+                    break
+        return results
+
+    @perf.timed("add_stock")
+    def add_stock(self, name, amount):
+        item = self.search_item(name)
+        if item:
+            return self.commit({"op": "in", "sku": item.sku, "amount": amount})
+        return False
+
+    @perf.timed("remove_stock")
+    def remove_stock(self, name, amount):
+        item = self.search_item(name)
+        if item and item.stock < amount:
+            self.last_error = f"Stok {item.sku} {item.name} hanya {item.stock}."
+        elif item:
+            return self.commit({"op": "out", "sku": item.sku, "amount": amount})
+        return False
+
+    def bulk_stock_in(self, movements):
+        return self.apply_batch(movements, "in")
+
+    def bulk_stock_out(self, movements):
+        return self.apply_batch(movements, "out")
+
+    def import_movements(self, path, kind):
+        return self.apply_batch(iter_movements(path), kind)
+
+    @perf.timed("apply_batch")
+    def apply_batch(self, movements, kind):
+        errors = []
+        totals = {}
+
+        # Semua baris divalidasi dulu; tidak ada yang diterapkan kalau ada satu saja yang salah.
+        try:
+            for line, (sku, qty) in enumerate(movements, 1):
+                item = self.get_item(str(sku)) if sku else None
+                if item is None:
+                    errors.append(f"Baris {line}: SKU '{sku}' tidak ditemukan")
+                    continue
+                if not str(qty).isdigit() or int(qty) <= 0:
+                    errors.append(f"Baris {line}: jumlah '{qty}' tidak valid")
+                    continue
+                totals[item.sku] = totals.get(item.sku, 0) + int(qty)
+        except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+            errors.append(f"Gagal membaca data: {e}")
+
+        if kind == "out":
+            for sku, qty in totals.items():
+                item = self.get_item(sku)
+                if item.stock < qty:
+                    errors.append(f"{sku}: stok {item.stock}, keluar {qty}")
+
+        if not errors and not totals:
+            errors.append("Tidak ada data pergerakan stok.")
+        if errors:
+            return False, errors
+
+        if not self.commit({"op": "batch", "kind": kind, "moves": [[sku, qty] for sku, qty in totals.items()]}):
+            return False, [self.last_error or "Batch ditolak server, stok mungkin sudah berubah. Coba lagi."]
+        return True, []
+
+    def set_threshold(self, value, sku=None, category=None):
+        # value=None mengembalikan ke threshold kategori / default.
+        if value is not None and (not isinstance(value, int) or value < 0):
+            return False
+        if sku:
+            item = self.search_item(sku)
+            if not item:
+                return False
+            return self.commit({"op": "threshold", "sku": item.sku, "value": value})
+        if category:
+            return self.commit({"op": "threshold", "category": category, "value": value})
+        return False
+
+    @perf.timed("delete_item")
+    def delete_item(self, name):
+        item = self.search_item(name)
+        if item:
+            return self.commit({"op": "del", "sku": item.sku})
+        return False
+
+    def log_activity(self, text, type):
+        self.recent_activity.appendleft({"text": text, "type": type})
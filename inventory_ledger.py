@@ -0,0 +1,165 @@
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from inventory_perf import perf
+
+class Ledger:
+    # Satu file segment per hari (YYYY-MM-DD.jsonl) plus ringkasan per hari di memory,
+    # jadi query rentang tanggal cukup menjumlah ringkasan harian tanpa membaca ulang segment.
+    # directory=None berarti hanya di memory (dipakai replica yang tidak menulis file).
+    def __init__(self, directory):
+        self.directory = directory
+        self.days = {}
+        self.buffer = []
+        self.lock = threading.Lock()
+
+    def segment_path(self, day):
+        return os.path.join(self.directory, f"{day}.jsonl")
+
+    def summary_path(self, day):
+        return os.path.join(self.directory, f"{day}.sum.json")
+
+    def load(self):
+        self.days = {}
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.endswith(".jsonl"):
+                day = filename[:-len(".jsonl")]
+                self.days[day] = self.load_day(day)
+
+    def load_day(self, day):
+        size = os.path.getsize(self.segment_path(day))
+        try:
+            with open(self.summary_path(day), "r") as f:
+                summary = json.load(f)
+            if summary.get("size") == size:
+                return summary["totals"]
+        except (OSError, ValueError):
+            pass
+
+        # Ringkasan belum ada atau segment bertambah sejak ringkasan ditulis: scan ulang sekali.
+        totals = new_day_totals()
+        with open(self.segment_path(day), "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                add_to_totals(totals, entry)
+        if day != str(date.today()):
+            self.write_summary(day, size, totals)
+        return totals
+
+    def write_summary(self, day, size, totals):
+        try:
+            with open(self.summary_path(day), "w") as f:
+                json.dump({"size": size, "totals": totals}, f)
+        except OSError as e:
+            print(f"Gagal menulis ringkasan ledger {day}: {e}")
+
+    def record(self, kind, sku, category, qty, ts=None):
+        ts = ts or time.time()
+        entry = {"ts": round(ts, 3), "kind": kind, "sku": sku, "category": category, "qty": qty}
+        day = str(date.fromtimestamp(ts))
+        with self.lock:
+            add_to_totals(self.days.setdefault(day, new_day_totals()), entry)
+            if self.directory:
+                self.buffer.append((day, entry))
+
+    @perf.timed("ledger_flush")
+    def flush(self):
+        with self.lock:
+            pending, self.buffer = self.buffer, []
+        if not pending:
+            return
+
+        lines = {}
+        for day, entry in pending:
+            lines.setdefault(day, []).append(json.dumps(entry) + "\n")
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for day, day_lines in lines.items():
+                payload = "".join(day_lines)
+                with open(self.segment_path(day), "a") as f:
+                    f.write(payload)
+                perf.add_bytes(len(payload))
+        except OSError:
+            with self.lock:
+                self.buffer = pending + self.buffer
+            raise
+
+    def day_total(self, kind, day=None):
+        totals = self.days.get(str(day or date.today()))
+        return totals[kind]["units"] if totals else 0
+
+    def iter_days(self, start=None, end=None):
+        for day in sorted(self.days):
+            if (start is None or day >= str(start)) and (end is None or day <= str(end)):
+                yield day, self.days[day]
+
+    def units(self, kind, start=None, end=None, sku=None, category=None):
+        total = 0
+        for day, totals in self.iter_days(start, end):
+            total += pick_units(totals[kind], sku, category)
+        return total
+
+    def by_period(self, kind, period="day", start=None, end=None, sku=None, category=None):
+        result = {}
+        for day, totals in self.iter_days(start, end):
+            key = period_key(day, period)
+            result[key] = result.get(key, 0) + pick_units(totals[kind], sku, category)
+        return result
+
+    def entries(self, start_ts, end_ts):
+        # Detail per transaksi: hanya segment hari yang masuk rentang yang dibaca.
+        day = date.fromtimestamp(start_ts)
+        last = date.fromtimestamp(end_ts)
+        while day <= last:
+            path = self.segment_path(day)
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            break
+                        if start_ts <= entry["ts"] <= end_ts:
+                            yield entry
+            day += timedelta(days=1)
+        for _, entry in self.buffer:
+            if start_ts <= entry["ts"] <= end_ts:
+                yield entry
+
+def new_day_totals():
+    return {
+        "in": {"units": 0, "sku": {}, "category": {}},
+        "out": {"units": 0, "sku": {}, "category": {}},
+    }
+
+def add_to_totals(totals, entry):
+    bucket = totals[entry["kind"]]
+    qty = entry["qty"]
+    bucket["units"] += qty
+    bucket["sku"][entry["sku"]] = bucket["sku"].get(entry["sku"], 0) + qty
+    bucket["category"][entry["category"]] = bucket["category"].get(entry["category"], 0) + qty
+
+def pick_units(bucket, sku=None, category=None):
+    if sku:
+        return bucket["sku"].get(sku, 0)
+    if category:
+        return bucket["category"].get(category, 0)
+    return bucket["units"]
+
+def period_key(day, period):
+    if period == "month":
+        return day[:7]
+    if period == "week":
+        year, week, _ = datetime.strptime(day, "%Y-%m-%d").isocalendar()
+        return f"{year}-W{week:02d}"
+    return day
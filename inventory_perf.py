@@ -0,0 +1,84 @@
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+PERF_BUFFER_SIZE = 1024
+
+class PerfRecorder:
+    def __init__(self, size=PERF_BUFFER_SIZE):
+        self.size = size
+        self.samples = {}
+        self.counts = {}
+        self.bytes_written = 0
+        self.lock = threading.Lock()
+
+    def record(self, op, ms):
+        with self.lock:
+            if op not in self.samples:
+                self.samples[op] = deque(maxlen=self.size)
+                self.counts[op] = 0
+            self.samples[op].append(ms)
+            self.counts[op] += 1
+
+    def add_bytes(self, count):
+        with self.lock:
+            self.bytes_written += count
+
+    @contextmanager
+    def timer(self, op):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(op, (time.perf_counter() - start) * 1000)
+
+    def timed(self, op):
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(op, (time.perf_counter() - start) * 1000)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        with self.lock:
+            buffers = {op: sorted(samples) for op, samples in self.samples.items()}
+            counts = dict(self.counts)
+            bytes_written = self.bytes_written
+
+        stats = {}
+        for op, ordered in buffers.items():
+            if not ordered:
+                continue
+            pick = lambda pct: ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+            stats[op] = {"count": counts[op], "p50": pick(50), "p95": pick(95), "p99": pick(99), "max": ordered[-1]}
+        return stats, bytes_written
+
+    def report(self):
+        stats, bytes_written = self.snapshot()
+        lines = [f"{'operation':<24} {'count':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+        for op in sorted(stats):
+            s = stats[op]
+            lines.append(f"{op:<24} {s['count']:>8} {s['p50']:>9.3f} {s['p95']:>9.3f} {s['p99']:>9.3f} {s['max']:>9.3f}")
+        lines.append(f"Bytes written: {bytes_written:,}")
+        return "\n".join(lines)
+
+    def reset(self):
+        with self.lock:
+            self.samples = {}
+            self.counts = {}
+            self.bytes_written = 0
+
+perf = PerfRecorder()
+
+def install_signal_dump():
+    # kill -USR1 <pid> mencetak statistik ke stdout tanpa mengganggu UI.
+    import signal
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: print(perf.report(), flush=True))
@@ -0,0 +1,179 @@
+import json
+import os
+import queue
+import socket
+import threading
+import time
+
+from inventory_core import InventorySystem, LOAD_PAGE_SIZE
+from inventory_ledger import Ledger
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+REQUEST_TIMEOUT = 10
+
+def parse_address(address):
+    host, _, port = (address or "").rpartition(":")
+    if not port.isdigit():
+        return (address or DEFAULT_HOST, DEFAULT_PORT)
+    return (host or DEFAULT_HOST, int(port))
+
+def send_message(sock, message):
+    sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+class RemoteConnection:
+    # Satu koneksi TCP per proses. Thread pembaca memisahkan balasan request dan
+    # notifikasi record; urutan di socket menjamin notifikasi datang sebelum balasannya.
+    def __init__(self, address, timeout=REQUEST_TIMEOUT):
+        self.address = address
+        self.timeout = timeout
+        self.sock = socket.create_connection(address, timeout=timeout)
+        self.sock.settimeout(None)
+        self.reader = self.sock.makefile("r", encoding="utf-8")
+        self.request_lock = threading.Lock()
+        self.request_id = 0
+        self.responses = queue.Queue()
+        self.records = queue.Queue()
+        self.closed = False
+        self.thread = threading.Thread(target=self.read_loop, name="inventory-remote", daemon=True)
+        self.thread.start()
+
+    def read_loop(self):
+        try:
+            for line in self.reader:
+                message = json.loads(line)
+                if "event" in message:
+                    self.records.put(message["record"])
+                else:
+                    self.responses.put(message)
+        except (OSError, ValueError):
+            pass
+        self.closed = True
+        self.responses.put({"ok": False, "error": "Koneksi ke server terputus."})
+
+    def request(self, message):
+        # Satu request aktif per koneksi, jadi balasan berikutnya pasti milik request ini.
+        with self.request_lock:
+            if self.closed:
+                return {"ok": False, "error": "Koneksi ke server terputus."}
+            self.request_id += 1
+            message["id"] = self.request_id
+            deadline = time.monotonic() + self.timeout
+            try:
+                send_message(self.sock, message)
+                while True:
+                    response = self.responses.get(timeout=max(deadline - time.monotonic(), 0))
+                    # Balasan request lama yang sudah timeout dibuang; tanpa id = koneksi terputus.
+                    if response.get("id") in (self.request_id, None):
+                        return response
+            except (OSError, queue.Empty) as e:
+                return {"ok": False, "error": f"Server tidak merespons: {str(e) or 'timeout'}"}
+
+    def close(self):
+        self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+class RemoteStorage:
+    # Storage replica: snapshot diambil dari server, penulisan dilakukan server.
+    def __init__(self, connection):
+        self.connection = connection
+
+    def exists(self):
+        return True
+
+    def signature(self):
+        return None
+
+    def iter_load(self, page_size=LOAD_PAGE_SIZE):
+        response = self.connection.request({"op": "snapshot"})
+        if not response.get("ok"):
+            raise OSError(response.get("error"))
+        items = response["items"]
+        for start in range(0, len(items), page_size):
+            yield "items", items[start:start + page_size]
+        yield "meta", response["meta"]
+
+    def iter_journal(self):
+        return iter(())
+
+    def append(self, records, meta):
+        pass
+
+    def save(self, data):
+        pass
+
+    def needs_compaction(self, force=False):
+        return False
+
+class RemoteInventorySystem(InventorySystem):
+    # Replica di memory dari InventorySystem milik inventory_server. Perubahan dikirim
+    # ke server; record yang sudah diterapkan server (dari counter mana saja) masuk
+    # lewat poll_changes di thread UI.
+    def __init__(self, address=None, verbose=True, lazy=False):
+        self.address = parse_address(address or os.environ.get("INVENTORY_SERVER"))
+        super().__init__(verbose=verbose, lazy=lazy)
+
+    def open_storage(self, backend, data_dir, lazy):
+        self.backend = "remote"
+        self.ledger = Ledger(None)
+        self.connection = RemoteConnection(self.address)
+        self.storage = RemoteStorage(self.connection)
+        self.log(f"Terhubung ke server inventory {self.address[0]}:{self.address[1]}")
+        if not lazy:
+            self.load_data()
+
+    def restore_meta(self, data):
+        super().restore_meta(data)
+        self.ledger.days = dict(data.get("ledger_days") or {})
+
+    def start_persistence(self):
+        pass
+
+    def close(self, compact=True):
+        self.connection.close()
+
+    def commit(self, record):
+        self.loaded.wait()
+        self.last_error = None
+        # Versi item yang dilihat counter ini; server menolak hapus kalau item sudah berubah.
+        skus = [sku for sku, _ in record["moves"]] if record["op"] == "batch" else [record.get("sku")]
+        record["versions"] = {sku: self.get_item(sku).version for sku in skus if sku and self.get_item(sku)}
+
+        response = self.connection.request({"op": "commit", "record": record})
+        self.poll_changes()
+        if not response.get("ok"):
+            # Alasan penolakan (mis. item sudah diubah counter lain) ditampilkan oleh pemanggil.
+            self.last_error = response.get("error")
+            self.log(f"Server menolak perubahan: {self.last_error}")
+            if self.connection.closed:
+                self.report_error(response.get("error"))
+            return False
+        if response.get("durable") is False:
+            self.report_error(response.get("error"))
+        return True
+
+    def poll_changes(self):
+        if not self.loaded.is_set():
+            return 0
+
+        applied = 0
+        while True:
+            try:
+                record = self.connection.records.get_nowait()
+            except queue.Empty:
+                return applied
+            # Record yang sudah termasuk di snapshot awal dilewati.
+            if record["seq"] <= self.journal_seq:
+                continue
+            before = self.dashboard_stats()
+            with self.lock:
+                self.apply_record(record)
+                self.record_ledger(record)
+                self.journal_seq = record["seq"]
+            self.emit("item", record)
+            self.emit_stats_changes(before)
+            applied += 1
@@ -0,0 +1,95 @@
+from bisect import bisect_left, insort
+
+REORDER_TARGET_FACTOR = 2
+
+class ReorderEngine:
+    # Hanya item di bawah threshold yang disimpan, terurut dari yang paling mendesak
+    # (stok / threshold terkecil). Catalog penuh tidak pernah discan untuk query low stock.
+    def __init__(self, default_threshold):
+        self.default_threshold = default_threshold
+        self.item_thresholds = {}
+        self.category_thresholds = {}
+        self.low = []
+        self.low_keys = {}
+        self.bulk = False
+
+    def __len__(self):
+        return len(self.low)
+
+    def clear(self):
+        self.low = []
+        self.low_keys = {}
+
+    def threshold_for(self, item):
+        # Dipanggil per item saat load, jadi dict kosong dilewati tanpa lookup.
+        if self.item_thresholds:
+            threshold = self.item_thresholds.get(item.sku.lower())
+            if threshold is not None:
+                return threshold
+        if self.category_thresholds:
+            return self.category_thresholds.get(item.category, self.default_threshold)
+        return self.default_threshold
+
+    def status(self, item):
+        if item.stock <= 0:
+            return "out"
+        return "low" if item.stock < self.threshold_for(item) else "ok"
+
+    def track(self, item, sign):
+        if sign < 0:
+            if not self.low_keys:
+                return
+            entry = self.low_keys.pop(item.sku.lower(), None)
+            if entry is None:
+                return
+            if self.bulk:
+                self.low.remove(entry)
+            else:
+                del self.low[bisect_left(self.low, entry)]
+            return
+
+        threshold = self.threshold_for(item)
+        if item.stock < threshold:
+            key = item.sku.lower()
+            entry = (item.stock / threshold if threshold > 0 else 0, key)
+            self.low_keys[key] = entry
+            if self.bulk:
+                self.low.append(entry)
+            else:
+                insort(self.low, entry)
+
+    def begin_bulk(self):
+        # Saat load, insort per item jadi kuadratik; kumpulkan dulu lalu sort sekali.
+        self.bulk = True
+
+    def end_bulk(self):
+        if self.bulk:
+            self.low.sort()
+            self.bulk = False
+
+    def rebuild(self, items):
+        self.clear()
+        entries = []
+        for item in items:
+            threshold = self.threshold_for(item)
+            if item.stock < threshold:
+                entry = (item.stock / threshold if threshold > 0 else 0, item.sku.lower())
+                self.low_keys[entry[1]] = entry
+                entries.append(entry)
+        entries.sort()
+        self.low = entries
+        self.bulk = False
+
+    def low_skus(self, limit=None):
+        entries = self.low[:limit] if limit else self.low
+        return [key for _, key in entries]
+
+    def reorder_qty(self, item):
+        return max(self.threshold_for(item) * REORDER_TARGET_FACTOR - item.stock, 0)
+
+    def export(self):
+        return {"items": dict(self.item_thresholds), "categories": dict(self.category_thresholds)}
+
+    def restore(self, data):
+        self.item_thresholds = dict(data.get("items", {}))
+        self.category_thresholds = dict(data.get("categories", {}))
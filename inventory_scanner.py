@@ -0,0 +1,165 @@
+import queue
+import threading
+import time
+from collections import deque
+
+from inventory_perf import perf
+
+SCAN_QUEUE_SIZE = 10000
+COALESCE_WINDOW_MS = 300
+SCAN_POLL_MS = 50
+MAX_DRAIN = 5000
+RECENT_SCAN_SIZE = 20
+
+def parse_scan(line):
+    # Scanner biasa hanya mengirim "SKU" + Enter; feed file boleh "SKU qty" atau "SKU,qty".
+    parts = line.replace(",", " ").split()
+    if len(parts) == 1:
+        return parts[0], 1
+    if len(parts) == 2 and parts[1].isdigit() and int(parts[1]) > 0:
+        return parts[0], int(parts[1])
+    return None
+
+def format_totals(totals, kind):
+    label = "masuk" if kind == "in" else "keluar"
+    return (f"Scan {totals['scans']:,} | Unit {label} {totals['units']:,} | Batch {totals['batches']:,} | "
+            f"Tidak dikenal {totals['unknown']:,} | Ditolak {totals['rejected']:,} | Dibuang {totals['dropped']:,}")
+
+class ScanSession:
+    # Scan masuk ke queue terbatas dari thread mana saja (keyboard wedge di UI, pembaca file / pipe).
+    # drain() dipanggil berkala di satu thread: scan SKU yang sama dalam satu window digabung
+    # jadi satu movement, lalu semuanya diterapkan sebagai satu record batch.
+    def __init__(self, system, kind="in", window_ms=COALESCE_WINDOW_MS, queue_size=SCAN_QUEUE_SIZE):
+        self.system = system
+        self.kind = kind
+        self.window = window_ms / 1000
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.pending = {}
+        self.pending_since = None
+        self.stopped = threading.Event()
+        self.readers = []
+        self.reset_totals()
+
+    def reset_totals(self):
+        self.totals = {"scans": 0, "units": 0, "batches": 0, "unknown": 0, "rejected": 0, "dropped": 0, "invalid": 0}
+        self.by_sku = {}
+        self.recent = deque(maxlen=RECENT_SCAN_SIZE)
+        self.errors = deque(maxlen=RECENT_SCAN_SIZE)
+
+    def feed(self, sku, qty=1, block=False):
+        # Keyboard wedge tidak boleh menahan UI: kalau queue penuh scan dibuang dan dihitung.
+        # Feed file / pipe menunggu (backpressure) supaya tidak ada baris yang hilang.
+        while True:
+            try:
+                self.queue.put((sku, qty), timeout=0.5 if block else None, block=block)
+                return True
+            except queue.Full:
+                if not block or self.stopped.is_set():
+                    self.totals["dropped"] += 1
+                    return False
+
+    def feed_line(self, line, block=False):
+        scan = parse_scan(line)
+        if scan is None:
+            if line.strip():
+                self.totals["invalid"] += 1
+                self.errors.append(f"Baris tidak valid: {line.strip()[:40]}")
+            return False
+        return self.feed(*scan, block=block)
+
+    def start_reader(self, source):
+        # source: path file / named pipe, atau stream yang sudah terbuka (mis. sys.stdin).
+        thread = threading.Thread(target=self.read_feed, args=(source,), name="scanner-feed", daemon=True)
+        self.readers.append(thread)
+        thread.start()
+        return thread
+
+    def read_feed(self, source):
+        try:
+            stream = open(source, "r", encoding="utf-8") if isinstance(source, str) else source
+            try:
+                for line in stream:
+                    if self.stopped.is_set():
+                        break
+                    self.feed_line(line, block=True)
+            finally:
+                if stream is not source:
+                    stream.close()
+        except (OSError, UnicodeDecodeError) as e:
+            self.errors.append(f"Feed berhenti: {e}")
+
+    def reading(self):
+        return any(thread.is_alive() for thread in self.readers)
+
+    def idle(self):
+        return self.queue.empty() and not self.pending
+
+    @perf.timed("scan_drain")
+    def drain(self, force=False):
+        for _ in range(MAX_DRAIN):
+            try:
+                sku, qty = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.totals["scans"] += 1
+            item = self.system.get_item(sku)
+            if item is None:
+                self.totals["unknown"] += 1
+                self.errors.append(f"SKU '{sku}' tidak ditemukan")
+                continue
+            if not self.pending:
+                self.pending_since = time.monotonic()
+            self.pending[item.sku] = self.pending.get(item.sku, 0) + qty
+
+        if self.pending and (force or time.monotonic() - self.pending_since >= self.window):
+            return self.apply_pending()
+        return 0
+
+    def apply_pending(self):
+        moves = []
+        for sku, qty in self.pending.items():
+            item = self.system.get_item(sku)
+            if item is None:
+                self.totals["rejected"] += qty
+                self.errors.append(f"{sku}: barang sudah dihapus")
+            elif self.kind == "out" and item.stock < qty:
+                # Kekurangan stok satu SKU tidak membatalkan scan SKU lain di batch yang sama.
+                self.totals["rejected"] += qty - max(item.stock, 0)
+                self.errors.append(f"{sku}: stok {item.stock}, keluar {qty}")
+                if item.stock > 0:
+                    moves.append((sku, item.stock))
+            else:
+                moves.append((sku, qty))
+        self.pending = {}
+        self.pending_since = None
+        if not moves:
+            return 0
+
+        ok, errors = self.system.apply_batch(moves, self.kind)
+        if not ok:
+            self.totals["rejected"] += sum(qty for _, qty in moves)
+            self.errors.extend(errors)
+            return 0
+
+        units = 0
+        sign = "+" if self.kind == "in" else "-"
+        for sku, qty in moves:
+            self.by_sku[sku] = self.by_sku.get(sku, 0) + qty
+            self.recent.append(f"{sign}{qty}x {sku}")
+            units += qty
+        self.totals["units"] += units
+        self.totals["batches"] += 1
+        return units
+
+    def set_kind(self, kind):
+        # Scan yang masih tertunda diterapkan dengan jenis lama dulu.
+        if kind != self.kind:
+            self.drain(force=True)
+            self.kind = kind
+
+    def stop(self):
+        self.stopped.set()
+        units = self.drain(force=True)
+        while not self.queue.empty():
+            units += self.drain(force=True)
+        return units
@@ -0,0 +1,302 @@
+import heapq
+import threading
+import time
+
+from inventory_perf import perf
+
+NGRAM_SIZE = 3
+SEARCH_BUDGET_MS = 30
+MAX_CANDIDATES = 2000
+MIN_FUZZY_WORD = 3
+
+# Skor per jenis kecocokan; makin besar makin relevan.
+SCORE_EXACT_SKU = 100
+SCORE_EXACT_NAME = 95
+SCORE_SKU_PREFIX = 90
+SCORE_NAME_PREFIX = 85
+SCORE_WORD_PREFIX = 80
+SCORE_SUBSTRING = 70
+SCORE_TOKENS = 60
+
+def normalize_text(text):
+    return " ".join(text.lower().split())
+
+def make_ngrams(text):
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+def max_edits(word):
+    return 1 if len(word) <= 5 else 2
+
+def bounded_distance(a, b, limit):
+    # Levenshtein yang berhenti begitu jaraknya pasti lebih dari limit.
+    if abs(len(a) - len(b)) > limit:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            cost = previous[j - 1] + (char_a != char_b)
+            value = min(previous[j] + 1, current[j - 1] + 1, cost)
+            current.append(value)
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+class BKTree:
+    # Node = [kata, {jarak: child}]; query hanya turun ke child yang jaraknya masih mungkin cocok.
+    def __init__(self):
+        self.root = None
+
+    def add(self, word):
+        if self.root is None:
+            self.root = [word, {}]
+            return
+        node = self.root
+        while True:
+            distance = levenshtein(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}]
+                return
+            node = child
+
+    def search(self, word, limit):
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = levenshtein(word, node_word)
+            if distance <= limit:
+                found.append((distance, node_word))
+            for child_distance, child in children.items():
+                if distance - limit <= child_distance <= distance + limit:
+                    stack.append(child)
+        return found
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+def fuzzy_word(word):
+    # Angka (mis. nomor seri di nama) tidak ikut BK-tree; typo di angka dicari lewat substring.
+    return len(word) >= MIN_FUZZY_WORD and not word.isdigit()
+
+def word_match(token, word):
+    if word.startswith(token):
+        return 1
+    if token in word:
+        return 0.9
+    if not (fuzzy_word(token) and fuzzy_word(word)):
+        return 0
+    distance = bounded_distance(token, word, max_edits(token))
+    return 0 if distance is None else 0.8 - 0.15 * distance
+
+class WordIndex:
+    # Kata di nama -> SKU, plus BK-tree kata non-angka untuk typo.
+    def __init__(self):
+        self.words = {}
+        self.item_words = {}
+        self.tree = BKTree()
+
+    def add(self, key, name):
+        words = set(normalize_text(name).split())
+        self.item_words[key] = words
+        for word in words:
+            if word not in self.words:
+                self.words[word] = set()
+                if fuzzy_word(word):
+                    self.tree.add(word)
+            self.words[word].add(key)
+
+    def remove(self, key):
+        # Kata tetap di BK-tree; hasilnya disaring lewat words yang sudah kosong.
+        for word in self.item_words.pop(key, ()):
+            keys = self.words.get(word)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.words[word]
+
+class SearchService:
+    # Pencarian ber-ranking di atas index InventorySystem (sku_index, name_index, n-gram),
+    # ditambah WordIndex untuk typo. Index dibangun saat query fuzzy pertama
+    # (UI memanggil ensure_index di thread terpisah setelah load).
+    def __init__(self, system, budget_ms=SEARCH_BUDGET_MS):
+        self.system = system
+        self.budget = budget_ms / 1000
+        self.words = None
+        self.built_for = None
+        self.build_lock = threading.Lock()
+        system.subscribe(self.on_change)
+
+    def on_change(self, event, payload):
+        if event != "item" or payload["op"] not in ("add", "del"):
+            return
+        # Dikunci supaya tidak bertabrakan dengan penukaran index hasil build di thread lain.
+        with self.system.lock:
+            if not self.ready():
+                return
+            if payload["op"] == "add":
+                self.words.add(payload["sku"].lower(), payload["name"])
+            else:
+                self.words.remove(payload["sku"].lower())
+
+    def ready(self):
+        # sku_index diganti objek baru setiap load ulang, jadi index kata ikut dibangun ulang.
+        return self.words is not None and self.built_for is self.system.sku_index
+
+    def ensure_index(self, wait=True):
+        # wait=False: kalau thread lain sedang membangun index, jangan ditunggu (query jalan tanpa typo).
+        if self.ready():
+            return True
+        if not self.build_lock.acquire(blocking=wait):
+            return False
+        try:
+            if not self.ready():
+                with perf.timer("search_index_build"):
+                    self.build_index()
+            return self.ready()
+        finally:
+            self.build_lock.release()
+
+    def build_index(self):
+        # Dibangun dari salinan sku_index tanpa memegang system.lock, supaya commit dan flush
+        # tidak tertahan; lock hanya dipakai untuk menyalin dan menukar hasilnya.
+        system = self.system
+        with system.lock:
+            built_for = system.sku_index
+            version = system.index_version
+            items = dict(built_for)
+            ngrams = {} if system.ngram_index is None else None
+
+        words = WordIndex()
+        for key, item in items.items():
+            words.add(key, item.name)
+            if ngrams is not None:
+                system.index_ngrams(item, ngrams)
+
+        with system.lock:
+            if system.sku_index is not built_for:
+                # Data dimuat ulang selama build; dibangun lagi saat dibutuhkan.
+                return
+            if system.index_version != version:
+                self.catch_up(items, words, ngrams)
+            if ngrams is not None and system.ngram_index is None:
+                system.ngram_index = ngrams
+            self.words = words
+            self.built_for = built_for
+
+    def catch_up(self, items, words, ngrams):
+        # Susulkan item yang ditambah / dihapus selama build (SKU dipakai ulang = objek baru).
+        system = self.system
+        for key, item in items.items():
+            if system.sku_index.get(key) is not item:
+                words.remove(key)
+                if ngrams is not None:
+                    system.unindex_ngrams(item, ngrams)
+        for key, item in system.sku_index.items():
+            if items.get(key) is not item:
+                words.add(key, item.name)
+                if ngrams is not None:
+                    system.index_ngrams(item, ngrams)
+
+    def score(self, text, tokens, item, fuzzy, memo):
+        sku = item.sku.lower()
+        name = normalize_text(item.name)
+        if sku == text:
+            return SCORE_EXACT_SKU
+        if name == text:
+            return SCORE_EXACT_NAME
+        if sku.startswith(text):
+            return SCORE_SKU_PREFIX
+        if name.startswith(text):
+            return SCORE_NAME_PREFIX
+        if len(tokens) == 1 and any(word.startswith(text) for word in name.split()):
+            return SCORE_WORD_PREFIX
+        if text in name or text in sku:
+            return SCORE_SUBSTRING
+        if not fuzzy:
+            return 0
+
+        # Tiap token query dicocokkan ke kata terbaik di nama; semua token harus ketemu.
+        total = 0
+        for token in tokens:
+            best = 1 if sku.startswith(token) else 0.9 if token in sku else 0
+            for word in name.split():
+                if best == 1:
+                    break
+                # Kata yang sama muncul di ribuan nama, jadi skor per pasangan disimpan selama satu query.
+                match = memo.get((token, word))
+                if match is None:
+                    match = memo[token, word] = word_match(token, word)
+                best = max(best, match)
+            if not best:
+                return 0
+            total += best
+        return SCORE_TOKENS * total / len(tokens)
+
+    def candidates(self, text, tokens, fuzzy, words, deadline):
+        system = self.system
+        keys = {}
+
+        # Urutan sumber: yang paling presisi dulu, supaya budget habis di kandidat yang berguna.
+        if text in system.sku_index:
+            keys[text] = None
+        for item in system.name_index.get(text, ()):
+            keys[item.sku.lower()] = None
+        # Transaksi (tanpa fuzzy) menilai semua yang cocok: prefix yang letaknya jauh di catalog
+        # tidak boleh kalah oleh substring yang kebetulan lebih awal.
+        for item in system.lookup_items(text, MAX_CANDIDATES if fuzzy else None):
+            keys[item.sku.lower()] = None
+        if words is None:
+            return keys
+
+        for token in tokens:
+            if token in words.words:
+                keys.update(dict.fromkeys(words.words[token]))
+            if fuzzy_word(token):
+                for _, word in sorted(words.tree.search(token, max_edits(token))):
+                    keys.update(dict.fromkeys(words.words.get(word, ())))
+            if len(keys) >= MAX_CANDIDATES or time.perf_counter() > deadline:
+                break
+        return keys
+
+    def rank(self, query, limit=10, fuzzy=True):
+        return [item for _, item in self.rank_scored(query, limit, fuzzy)]
+
+    @perf.timed("rank_items")
+    def rank_scored(self, query, limit=10, fuzzy=True):
+        text = normalize_text(query)
+        if not text:
+            return []
+        # Build index pertama kali tidak dihitung ke budget query.
+        words = self.words if fuzzy and self.ensure_index(wait=False) else None
+        deadline = time.perf_counter() + self.budget
+        tokens = text.split()
+        scored = []
+        memo = {}
+
+        for i, key in enumerate(self.candidates(text, tokens, fuzzy, words, deadline), 1):
+            item = self.system.sku_index.get(key)
+            if item is None:
+                continue
+            score = self.score(text, tokens, item, fuzzy, memo)
+            if score:
+                scored.append((-score, self.system.item_order[key], item))
+            # Lewat budget: kembalikan yang terbaik dari kandidat yang sudah dinilai. Tanpa fuzzy
+            # (dipakai transaksi) semua kandidat dinilai supaya hasilnya selalu sama.
+            if fuzzy and i % 256 == 0 and time.perf_counter() > deadline:
+                break
+        return [(-score, item) for score, _, item in heapq.nsmallest(limit, scored, key=lambda entry: entry[:2])]
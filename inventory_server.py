@@ -0,0 +1,201 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from inventory_core import PERSIST_INTERVAL, InventorySystem
+from inventory_perf import perf
+from inventory_remote import DEFAULT_HOST, DEFAULT_PORT
+
+GROUP_COMMIT_WINDOW = 0.005
+GROUP_COMMIT_MAX = 256
+
+def check_record(system, record):
+    # Validasi ulang di server: replica counter bisa tertinggal beberapa milidetik.
+    versions = record.pop("versions", None) or {}
+    op = record.get("op")
+
+    if op == "add":
+        if not record.get("name") or not record.get("category"):
+            return "Nama dan kategori wajib diisi."
+        if not isinstance(record.get("price"), int) or not isinstance(record.get("stock"), int):
+            return "Harga dan stok harus angka."
+        # SKU ditentukan server supaya dua counter tidak memakai nomor yang sama.
+        record["sku"] = system.next_sku(record["category"])
+        return None
+
+    if op == "del":
+        item = system.get_item(record.get("sku", ""))
+        if item is None:
+            return f"SKU '{record.get('sku')}' tidak ditemukan."
+        if versions.get(item.sku, item.version) != item.version:
+            return f"{item.sku} sudah diubah counter lain, muat ulang dulu."
+        return None
+
+    if op == "threshold":
+        value = record.get("value")
+        if value is not None and (not isinstance(value, int) or value < 0):
+            return f"Threshold '{value}' tidak valid."
+        if "sku" in record:
+            item = system.get_item(str(record["sku"]))
+            if item is None:
+                return f"SKU '{record['sku']}' tidak ditemukan."
+            record["sku"] = item.sku
+        elif not record.get("category"):
+            return "Threshold butuh SKU atau kategori."
+        return None
+
+    if op in ("in", "out"):
+        kind, moves = op, [(record.get("sku", ""), record.get("amount"))]
+    elif op == "batch" and record.get("kind") in ("in", "out"):
+        kind, moves = record["kind"], record.get("moves") or []
+    else:
+        return f"Operasi '{op}' tidak dikenal."
+
+    # Stock in/out saling komutatif, jadi versi lama tidak ditolak;
+    # cukup dicek ulang terhadap stok terbaru.
+    for sku, amount in moves:
+        item = system.get_item(str(sku))
+        if item is None:
+            return f"SKU '{sku}' tidak ditemukan."
+        if not isinstance(amount, int) or amount <= 0:
+            return f"Jumlah '{amount}' tidak valid."
+        if kind == "out" and item.stock < amount:
+            return f"{item.sku}: stok {item.stock}, keluar {amount}"
+    return None
+
+class InventoryServer:
+    def __init__(self, system, window=GROUP_COMMIT_WINDOW):
+        self.system = system
+        self.window = window
+        self.clients = set()
+        self.pending = None
+        self.server = None
+        # Commit ditulis per grup oleh server, bukan per record.
+        self.system.autoflush = False
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.pending = asyncio.Queue()
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        self.commit_task = asyncio.create_task(self.commit_loop())
+        return self.server
+
+    def snapshot(self):
+        with self.system.lock:
+            items = [
+                {"name": item.name, "sku": item.sku, "category": item.category,
+                 "price": item.price, "stock": item.stock, "version": item.version}
+                for item in self.system.items
+            ]
+            meta = self.system.snapshot_meta()
+            # Ringkasan harian seluruh ledger, supaya analytics dan history di counter memakai riwayat penuh.
+            meta["ledger_days"] = self.system.ledger.days
+        return {"ok": True, "items": items, "meta": meta}
+
+    def send(self, writer, message):
+        if not writer.is_closing():
+            writer.write((json.dumps(message) + "\n").encode("utf-8"))
+
+    async def handle_client(self, reader, writer):
+        self.clients.add(writer)
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    self.send(writer, {"ok": False, "error": "Pesan bukan JSON."})
+                    continue
+                if message.get("op") == "snapshot":
+                    self.send(writer, dict(self.snapshot(), id=message.get("id")))
+                elif message.get("op") == "commit" and isinstance(message.get("record"), dict):
+                    await self.pending.put((writer, message))
+                else:
+                    self.send(writer, {"id": message.get("id"), "ok": False, "error": "Request tidak dikenal."})
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    async def commit_loop(self):
+        loop = asyncio.get_running_loop()
+        durable = True
+        while True:
+            try:
+                # Selama flush gagal, record yang tertunda dicoba tulis ulang tiap interval.
+                group = [await asyncio.wait_for(self.pending.get(), None if durable else PERSIST_INTERVAL)]
+            except asyncio.TimeoutError:
+                durable = await loop.run_in_executor(None, self.system.flush)
+                continue
+            # Tunggu sebentar supaya movement dari counter lain ikut satu flush.
+            await asyncio.sleep(self.window)
+            while not self.pending.empty() and len(group) < GROUP_COMMIT_MAX:
+                group.append(self.pending.get_nowait())
+
+            applied = []
+            replies = []
+            for writer, message in group:
+                record = message["record"]
+                error = check_record(self.system, record)
+                if error:
+                    replies.append((writer, {"id": message.get("id"), "ok": False, "error": error}))
+                    continue
+                if not self.system.commit(record):
+                    replies.append((writer, {"id": message.get("id"), "ok": False, "error": self.system.last_error}))
+                    continue
+                applied.append(record)
+                replies.append((writer, {"id": message.get("id"), "ok": True, "seq": record["seq"]}))
+
+            if applied:
+                with perf.timer("group_commit"):
+                    durable = await loop.run_in_executor(None, self.system.flush)
+                if not durable:
+                    # Record sudah diterapkan di memory (dan dikirim ke semua counter), tapi belum
+                    # aman di disk; balasan tidak boleh mengaku tersimpan.
+                    for _, reply in replies:
+                        if reply["ok"]:
+                            reply["durable"] = False
+                            reply["error"] = "Perubahan diterapkan tapi belum tersimpan ke disk server, sedang dicoba lagi."
+
+            # Notifikasi dikirim sebelum balasan, jadi client sudah punya record-nya saat balasan tiba.
+            for record in applied:
+                for client in list(self.clients):
+                    self.send(client, {"event": "record", "record": record})
+            for writer, reply in replies:
+                self.send(writer, reply)
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.commit_task.cancel()
+        for writer in list(self.clients):
+            writer.close()
+        self.system.close()
+
+async def serve(system, host, port):
+    server = InventoryServer(system)
+    await server.start(host, port)
+    print(f"Server inventory jalan di {host}:{port} ({len(system.items):,} item)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server inventory untuk beberapa counter di satu mesin.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--backend", choices=["binary", "json", "sqlite"], help="default: INVENTORY_BACKEND atau binary")
+    parser.add_argument("--data-dir", help="folder data (default: folder aplikasi)")
+    args = parser.parse_args(argv)
+
+    system = InventorySystem(args.backend, args.data_dir)
+    try:
+        asyncio.run(serve(system, args.host, args.port))
+    except KeyboardInterrupt:
+        print("Server dihentikan.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+# Layout (little-endian):
+#   header   : magic, versi format, jumlah item, jumlah string, tabel section
+#   section  : offset, panjang, crc32 per section, jadi lookup cukup memverifikasi section yang dibaca
+#   price    : int64[count]      stock     : int64[count]
+#   name     : uint32[count]     category  : uint32[count]     sku : uint32[count]  (id string)
+#   sku_index: uint32[count]     nomor baris terurut menurut sku.lower()
+#   str_off  : uint64[strings+1] offset byte tiap string di str_data
+#   str_data : string UTF-8 dipisah "\0"
+#   meta     : JSON kecil (recent_activity, thresholds, journal_seq, ...)
+MAGIC = b"INVSNAP\x00"
+FORMAT_VERSION = 1
+SECTIONS = ("price", "stock", "name", "category", "sku", "sku_index", "str_off", "str_data", "meta")
+SECTION_TYPES = {"price": "q", "stock": "q", "name": "I", "category": "I", "sku": "I", "sku_index": "I", "str_off": "Q"}
+HEADER = struct.Struct("<8sHHII")
+SECTION_ENTRY = struct.Struct("<QQI")
+HEADER_SIZE = HEADER.size + SECTION_ENTRY.size * len(SECTIONS) + 4
+
+class SnapshotError(ValueError):
+    pass
+
+def column(typecode, values):
+    data = array(typecode, values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+def write_snapshot(path, data):
+    items = data["items"]
+    strings = []
+    string_ids = {}
+
+    def intern_string(text):
+        # Kategori (dan nama kembar) cukup disimpan sekali di tabel string.
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text.replace("\0", ""))
+        return string_ids[text]
+
+    names = [intern_string(item["name"]) for item in items]
+    categories = [intern_string(item["category"]) for item in items]
+    skus = [intern_string(item["sku"]) for item in items]
+    sku_index = sorted(range(len(items)), key=lambda i: items[i]["sku"].lower())
+
+    encoded = [text.encode("utf-8") for text in strings]
+    offsets = [0]
+    for chunk in encoded:
+        offsets.append(offsets[-1] + len(chunk) + 1)
+
+    meta = {key: value for key, value in data.items() if key != "items"}
+    sections = {
+        "price": column("q", (item["price"] for item in items)),
+        "stock": column("q", (item["stock"] for item in items)),
+        "name": column("I", names),
+        "category": column("I", categories),
+        "sku": column("I", skus),
+        "sku_index": column("I", sku_index),
+        "str_off": column("Q", offsets),
+        "str_data": b"\0".join(encoded) + b"\0" if encoded else b"",
+        "meta": json.dumps(meta).encode("utf-8"),
+    }
+
+    entries = []
+    offset = HEADER_SIZE
+    for name in SECTIONS:
+        # Section 8-byte aligned supaya bisa di-cast langsung dari mmap.
+        offset += -offset % 8
+        entries.append((offset, len(sections[name]), zlib.crc32(sections[name])))
+        offset += len(sections[name])
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(items), len(strings))
+    header += b"".join(SECTION_ENTRY.pack(*entry) for entry in entries)
+    header += struct.pack("<I", zlib.crc32(header))
+
+    with open(path, "wb") as f:
+        f.write(header)
+        for name, (start, _, _) in zip(SECTIONS, entries):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(sections[name])
+        f.flush()
+        os.fsync(f.fileno())
+    return offset
+
+class BinarySnapshot:
+    # Dibaca lewat mmap: kolom angka di-cast tanpa copy, string hanya didecode saat dipakai.
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise SnapshotError("File snapshot kosong")
+        self.view = memoryview(self.map)
+        self.verified = set()
+        try:
+            self.read_header()
+        except (SnapshotError, struct.error):
+            self.close()
+            raise
+
+    def read_header(self):
+        if len(self.map) < HEADER_SIZE:
+            raise SnapshotError("File snapshot terpotong")
+        magic, version, _, self.count, self.string_count = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise SnapshotError("Bukan file snapshot inventory")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"Versi snapshot {version} tidak didukung")
+        (header_crc,) = struct.unpack_from("<I", self.map, HEADER_SIZE - 4)
+        if zlib.crc32(self.map[:HEADER_SIZE - 4]) != header_crc:
+            raise SnapshotError("Checksum header tidak cocok")
+
+        self.sections = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length, crc = SECTION_ENTRY.unpack_from(self.map, HEADER.size + i * SECTION_ENTRY.size)
+            if offset + length > len(self.map):
+                raise SnapshotError(f"Section {name} terpotong")
+            self.sections[name] = (offset, length, crc)
+
+    def raw(self, name):
+        offset, length, crc = self.sections[name]
+        data = self.view[offset:offset + length]
+        if name not in self.verified:
+            if zlib.crc32(data) != crc:
+                raise SnapshotError(f"Checksum section {name} tidak cocok")
+            self.verified.add(name)
+        return data
+
+    def column(self, name):
+        data = self.raw(name)
+        if sys.byteorder == "little":
+            return data.cast(SECTION_TYPES[name])
+        values = array(SECTION_TYPES[name], data.tobytes())
+        values.byteswap()
+        return values
+
+    def verify(self):
+        for name in SECTIONS:
+            self.raw(name)
+
+    def meta(self):
+        return json.loads(self.raw("meta").tobytes().decode("utf-8"))
+
+    def string(self, string_id):
+        offsets = self.column("str_off")
+        return self.raw("str_data")[offsets[string_id]:offsets[string_id + 1] - 1].tobytes().decode("utf-8")
+
+    def all_strings(self):
+        if not self.string_count:
+            return []
+        # Satu decode + split jauh lebih cepat daripada decode per string saat load penuh.
+        return self.raw("str_data")[:-1].tobytes().decode("utf-8").split("\0")
+
+    def row(self, i):
+        return {
+            "name": self.string(self.column("name")[i]),
+            "sku": self.string(self.column("sku")[i]),
+            "category": self.string(self.column("category")[i]),
+            "price": self.column("price")[i],
+            "stock": self.column("stock")[i],
+        }
+
+    def find(self, sku):
+        # Binary search di sku_index; hanya string SKU yang disentuh yang didecode.
+        key = sku.strip().lower()
+        index = self.column("sku_index")
+        skus = self.column("sku")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = self.string(skus[index[mid]]).lower()
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                return self.row(index[mid])
+        return None
+
+    def iter_pages(self, page_size):
+        strings = self.all_strings()
+        names = self.column("name").tolist()
+        categories = self.column("category").tolist()
+        skus = self.column("sku").tolist()
+        prices = self.column("price").tolist()
+        stocks = self.column("stock").tolist()
+        for start in range(0, self.count, page_size):
+            end = min(start + page_size, self.count)
+            yield [
+                {"name": strings[names[i]], "sku": strings[skus[i]], "category": strings[categories[i]],
+                 "price": prices[i], "stock": stocks[i]}
+                for i in range(start, end)
+            ]
+
+    def close(self):
+        self.view.release()
+        self.map.close()
+        self.file.close()
@@ -7,9 +7,30 @@ elif __file__:
     application_path = os.path.dirname(__file__)
 
 file_path = os.path.join(application_path, "inventory_data.json")
+journal_path = os.path.join(application_path, "inventory_journal.log")
+db_path = os.path.join(application_path, "inventory_data.db")
+bin_path = os.path.join(application_path, "inventory_data.bin")
+ledger_dir = os.path.join(application_path, "ledger")
 
-if os.path.exists(file_path):
-    os.remove(file_path)
+json_files = [file_path, file_path + ".tmp"]
+sqlite_files = [db_path, db_path + "-wal", db_path + "-shm"]
+binary_files = [bin_path, bin_path + ".tmp", bin_path + ".corrupt", bin_path + ".migrated"]
+ledger_files = [os.path.join(ledger_dir, name) for name in os.listdir(ledger_dir)] if os.path.isdir(ledger_dir) else []
+
+# python reset.py [json|binary|sqlite|ledger|all]
+target = sys.argv[1] if len(sys.argv) > 1 else "all"
+paths = []
+if target in ("json", "all"): paths += json_files
+if target in ("binary", "all"): paths += binary_files
+# Journal dipakai bersama JSON dan biner; hanya dihapus kalau tidak ada snapshot yang masih membutuhkannya.
+if target in ("binary", "all") or (target == "json" and not os.path.exists(bin_path)): paths.append(journal_path)
+if target in ("sqlite", "all"): paths += sqlite_files
+if target in ("ledger", "all"): paths += ledger_files
+
+existing = [path for path in paths if os.path.exists(path)]
+if existing:
+    for path in existing:
+        os.remove(path)
     print("Berhasil")
 else:   
-    print("Gagal")   
\ No newline at end of file
+    print("Gagal")   
@@ -0,0 +1,86 @@
+from inventory_core import InventorySystem
+
+def open_system(data_dir, backend="json"):
+    return InventorySystem(backend, str(data_dir), verbose=False)
+
+def stock(system, sku):
+    return system.get_item(sku).stock
+
+def test_torn_journal_tail_does_not_swallow_later_records(tmp_path):
+    system = open_system(tmp_path)
+    system.add_item("Mouse", "Computer", 1000, 5)
+    system.add_stock("COM-001", 1)
+    system.close(compact=False)
+
+    # Crash saat menulis: baris terakhir hanya setengah.
+    with open(tmp_path / "inventory_journal.log", "a") as f:
+        f.write('{"op": "in", "sku": "COM-001", "amo')
+
+    system = open_system(tmp_path)
+    assert stock(system, "COM-001") == 6
+    system.add_stock("COM-001", 10)
+    assert stock(system, "COM-001") == 16
+    system.close(compact=False)
+
+    system = open_system(tmp_path)
+    assert stock(system, "COM-001") == 16
+    system.close()
+
+def test_corrupt_record_in_middle_of_journal_fails_load(tmp_path):
+    system = open_system(tmp_path)
+    system.add_item("Mouse", "Computer", 1000, 5)
+    system.add_stock("COM-001", 1)
+    system.close(compact=False)
+
+    journal = tmp_path / "inventory_journal.log"
+    lines = journal.read_text().splitlines(keepends=True)
+    journal.write_text(lines[0][:10] + "\n" + lines[1])
+
+    system = open_system(tmp_path)
+    assert system.load_failed
+    system.close()
+    assert journal.read_text() == lines[0][:10] + "\n" + lines[1]
+
+def make_binary_history(data_dir):
+    # Snapshot biner seq 2 + journal mulai seq 3; inventory_data.json masih seq 0.
+    system = open_system(data_dir, "binary")
+    system.add_item("Mouse", "Computer", 1000, 5)
+    system.add_stock("COM-001", 1)
+    system.close()
+    system = open_system(data_dir, "binary")
+    system.add_stock("COM-001", 10)
+    system.close(compact=False)
+
+def test_json_refuses_journal_that_skips_seq(tmp_path):
+    make_binary_history(tmp_path)
+    journal = tmp_path / "inventory_journal.log"
+    (tmp_path / "inventory_data.bin").unlink()
+    journal_before = journal.read_bytes()
+
+    system = open_system(tmp_path)
+    assert system.load_failed
+    system.close()
+    assert journal.read_bytes() == journal_before
+
+def test_switch_to_json_migrates_from_binary(tmp_path):
+    make_binary_history(tmp_path)
+
+    system = open_system(tmp_path)
+    assert not system.load_failed
+    assert stock(system, "COM-001") == 16
+    system.close()
+    assert not (tmp_path / "inventory_data.bin").exists()
+
+    system = open_system(tmp_path)
+    assert stock(system, "COM-001") == 16
+    system.close()
+
+def test_switch_to_sqlite_migrates_from_binary(tmp_path):
+    make_binary_history(tmp_path)
+
+    system = open_system(tmp_path, "sqlite")
+    assert stock(system, "COM-001") == 16
+    system.close()
+    system = open_system(tmp_path, "sqlite")
+    assert stock(system, "COM-001") == 16
+    system.close()
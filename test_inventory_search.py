@@ -0,0 +1,75 @@
+import inventory_search
+from inventory_core import InventorySystem
+
+def open_system(data_dir):
+    system = InventorySystem("json", str(data_dir), verbose=False)
+    system.autoflush = False
+    return system
+
+def test_find_item_prefers_prefix_beyond_candidate_cap(tmp_path):
+    system = open_system(tmp_path)
+    for i in range(inventory_search.MAX_CANDIDATES + 500):
+        system.add_item(f"Showcase {i}", "Display", 1000, 1)
+    system.add_item("Case Hardshell", "Audio", 1000, 1)
+
+    assert system.rank_items("case", 1)[0].name == "Case Hardshell"
+    assert system.find_item("case").name == "Case Hardshell"
+
+def test_index_build_catches_up_changes_made_during_build(tmp_path, monkeypatch):
+    system = open_system(tmp_path)
+    for name in ("Orion Mouse", "Nova Keyboard", "Flux Headset"):
+        system.add_item(name, "Computer", 1000, 1)
+    keyboard = system.find_item("Nova Keyboard").sku
+
+    class ChangingWordIndex(inventory_search.WordIndex):
+        # Commit dari thread lain terjadi di tengah build (di sini disimulasikan di add pertama).
+        changed = False
+
+        def add(self, key, name):
+            if not ChangingWordIndex.changed:
+                ChangingWordIndex.changed = True
+                system.add_item("Zyphor Headphone", "Audio", 1000, 1)
+                system.delete_item(keyboard)
+            super().add(key, name)
+
+    monkeypatch.setattr(inventory_search, "WordIndex", ChangingWordIndex)
+    assert system.search.ensure_index()
+
+    assert [item.name for item in system.rank_items("zyphr")] == ["Zyphor Headphone"]
+    assert system.rank_items("keybord") == []
+    assert [item.name for item in system.search_items("phor")] == ["Zyphor Headphone"]
+
+def test_substring_search_during_background_load_finds_late_items(tmp_path):
+    system = open_system(tmp_path)
+    for i in range(3000):
+        system.add_item(f"Kabel Data {i}", "Kabel", 1000, 1)
+    system.add_item("Zyphor Headphone", "Audio", 1000, 1)
+    system.close()
+
+    system = InventorySystem("json", str(tmp_path), verbose=False, lazy=True)
+    system.start_background_load()
+    # Index n-gram dibangun selagi loader masih menambah halaman.
+    system.search_items("kabel data 1")
+    system.loaded.wait()
+    assert [item.name for item in system.search_items("zyphor")] == ["Zyphor Headphone"]
+    system.close()
+
+def test_ambiguous_partial_name_is_refused_for_transactions(tmp_path):
+    system = open_system(tmp_path)
+    system.add_item("Mouse Pad", "Computer", 1000, 5)
+    system.add_item("Mouse", "Computer", 1000, 5)
+    system.add_item("Keyboard", "Computer", 1000, 5)
+
+    assert system.find_item("mo") is None
+    assert not system.add_stock("mo", 1)
+    assert "COM-001" in system.last_error and "COM-002" in system.last_error
+    assert not system.add_stock("zzz", 1)
+    assert "tidak ditemukan" in system.last_error
+
+    # Nama persis dan satu skor tertinggi tetap diterima.
+    assert system.find_item("mouse").sku == "COM-002"
+    assert system.find_item("mouse p").sku == "COM-001"
+    assert system.remove_stock("mouse", 2)
+    assert system.get_item("COM-002").stock == 3
+    assert not system.remove_stock("keyboard", 10)
+    assert "hanya 5" in system.last_error
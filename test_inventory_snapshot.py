@@ -0,0 +1,139 @@
+import json
+import os
+
+import pytest
+
+from inventory_core import InventorySystem
+from inventory_snapshot import BinarySnapshot, SnapshotError, write_snapshot
+
+def make_items(count):
+    return [
+        {"name": f"Barang {i} é", "sku": f"AUD-{i:03d}", "category": "Audio" if i % 2 else "Kabel", "price": 1000 + i, "stock": i}
+        for i in range(count)
+    ]
+
+def write_json(data_dir, items, journal_seq=0):
+    data = {"date": "2024-01-01", "recent_activity": [], "journal_seq": journal_seq, "items": items}
+    with open(os.path.join(data_dir, "inventory_data.json"), "w") as f:
+        json.dump(data, f)
+
+def open_system(data_dir, lazy=False):
+    return InventorySystem("binary", str(data_dir), verbose=False, lazy=lazy)
+
+def flip_byte(path, section):
+    snapshot = BinarySnapshot(path)
+    offset = snapshot.sections[section][0]
+    snapshot.close()
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+def stock_by_sku(system):
+    return {item.sku: item.stock for item in system.items}
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "data.bin")
+    items = make_items(50)
+    write_snapshot(path, {"journal_seq": 7, "thresholds": {"items": {}, "categories": {}}, "items": items})
+
+    snapshot = BinarySnapshot(path)
+    try:
+        snapshot.verify()
+        assert snapshot.meta()["journal_seq"] == 7
+        assert [row for page in snapshot.iter_pages(16) for row in page] == items
+        assert snapshot.find("aud-031") == items[31]
+        assert snapshot.find("AUD-999") is None
+    finally:
+        snapshot.close()
+
+def test_round_trip_empty(tmp_path):
+    path = str(tmp_path / "data.bin")
+    write_snapshot(path, {"journal_seq": 0, "items": []})
+    snapshot = BinarySnapshot(path)
+    try:
+        snapshot.verify()
+        assert list(snapshot.iter_pages(16)) == []
+        assert snapshot.find("AUD-001") is None
+    finally:
+        snapshot.close()
+
+@pytest.mark.parametrize("section", ["stock", "str_data", "meta"])
+def test_corrupt_section_detected(tmp_path, section):
+    path = str(tmp_path / "data.bin")
+    write_snapshot(path, {"journal_seq": 0, "items": make_items(10)})
+    flip_byte(path, section)
+    snapshot = BinarySnapshot(path)
+    try:
+        with pytest.raises(SnapshotError):
+            snapshot.verify()
+    finally:
+        snapshot.close()
+
+def test_migration_written_by_close_without_compact(tmp_path):
+    write_json(tmp_path, make_items(20))
+    system = open_system(tmp_path)
+    system.close(compact=False)
+    assert os.path.exists(tmp_path / "inventory_data.bin")
+
+    system = open_system(tmp_path)
+    assert not system.storage.rewrite
+    assert len(system.items) == 20
+    system.close()
+
+def test_close_during_first_load_keeps_catalog(tmp_path):
+    write_json(tmp_path, make_items(20000))
+    system = open_system(tmp_path, lazy=True)
+    system.start_background_load()
+    system.close()
+
+    system = open_system(tmp_path)
+    assert len(system.items) == 20000
+    system.close()
+
+def test_corrupt_snapshot_falls_back_to_current_json(tmp_path):
+    items = make_items(20)
+    write_json(tmp_path, items)
+    open_system(tmp_path).close()
+    flip_byte(str(tmp_path / "inventory_data.bin"), "stock")
+
+    system = open_system(tmp_path)
+    assert not system.load_failed
+    assert stock_by_sku(system) == {item["sku"]: item["stock"] for item in items}
+    assert os.path.exists(tmp_path / "inventory_data.bin.corrupt")
+    system.close()
+
+    # Snapshot ditulis ulang dari JSON dan bisa dibaca lagi.
+    system = open_system(tmp_path)
+    assert not system.storage.rewrite and len(system.items) == 20
+    system.close()
+
+def test_corrupt_snapshot_with_stale_json_is_not_loaded(tmp_path):
+    write_json(tmp_path, make_items(20))
+    system = open_system(tmp_path)
+    system.add_item("Headset Baru", "Audio", 5000, 1)
+    system.add_stock("AUD-001", 100)
+    system.close()
+    system = open_system(tmp_path)
+    system.add_stock("AUD-002", 5)
+    system.close(compact=False)
+
+    bin_file = tmp_path / "inventory_data.bin"
+    journal_file = tmp_path / "inventory_journal.log"
+    flip_byte(str(bin_file), "stock")
+    bin_before, journal_before = bin_file.read_bytes(), journal_file.read_bytes()
+
+    system = open_system(tmp_path)
+    assert system.load_failed
+    assert system.items == []
+    # Perubahan baru ditolak supaya tidak ikut masuk journal / snapshot yang sedang rusak.
+    assert not system.add_item("Kabel Baru", "Kabel", 1000, 1)
+    assert system.last_error
+    assert not system.set_threshold(3, category="Audio")
+    assert system.poll_errors()
+    system.close()
+    # Tidak ada yang ditimpa: snapshot rusak dan journal tetap untuk dipulihkan.
+    assert bin_file.read_bytes() == bin_before
+    assert journal_file.read_bytes() == journal_before
+    assert (tmp_path / "inventory_data.bin.corrupt").read_bytes() == bin_before
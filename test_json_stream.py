@@ -0,0 +1,57 @@
+import io
+import json
+import random
+
+import pytest
+
+from inventory_core import JsonStream
+
+def parse(text, chunk_size):
+    stream = JsonStream(io.StringIO(text), chunk_size)
+    data = {}
+    for key in stream.iter_object():
+        if key == "items":
+            data[key] = list(stream.iter_array())
+        else:
+            data[key] = stream.read_value()
+    return data
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(9 if depth < 2 else 6)
+    if kind == 0:
+        return rng.randint(-10**6, 10**6)
+    if kind == 1:
+        return rng.choice([1.5, -0.25, 1.5e3, 2.5e-7, 123456.789, 1e21])
+    if kind == 2:
+        return "".join(rng.choice('ab "\\\\é\\n,]}:1') for _ in range(rng.randrange(8)))
+    if kind == 3:
+        return rng.choice([True, False, None])
+    if kind in (4, 5):
+        return rng.randrange(100)
+    if kind == 6:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randrange(4))}
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 13, 64])
+def test_number_split_at_chunk_boundary(chunk_size):
+    text = '{"items": [1.5, 2, -3.25e2, 1.5e3, 10, 0.001], "journal_seq": 1.5e1}'
+    assert parse(text, chunk_size) == json.loads(text)
+
+def test_chunk_size_fuzz():
+    rng = random.Random(6)
+    for _ in range(40):
+        doc = {
+            "date": "2024-01-01",
+            "items": [random_value(rng) for _ in range(rng.randrange(20))],
+            "journal_seq": rng.randrange(1000),
+        }
+        for indent in (None, 4):
+            text = json.dumps(doc, indent=indent)
+            for chunk_size in range(1, 24):
+                assert parse(text, chunk_size) == doc
+
+@pytest.mark.parametrize("text", ['{"items": [1 2]}', '{"items": [1.5x]}', '{"items": [1, 2}', '{"items" [1]}'])
+def test_invalid_json_rejected(text):
+    for chunk_size in (1, 3, 64):
+        with pytest.raises(ValueError):
+            parse(text, chunk_size)